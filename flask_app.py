@@ -1,8 +1,9 @@
 """
-Standalone Flask health endpoint for UptimeRobot monitoring
-Runs on port 5000 and completely isolated from the bot
+Flask health endpoint for UptimeRobot monitoring
+Listens on $PORT (default 10000); run.py serves it from a daemon thread in the launcher process
 """
 import logging
+import os
 from flask import Flask
 
 # Suppress werkzeug logs
@@ -17,14 +18,12 @@ def health():
     """Health check endpoint for UptimeRobot"""
     return "OK", 200
 
-if __name__ == '__main__':
-    print("🌐 Flask health server starting on 0.0.0.0:5000", flush=True)
-    app.run(host='0.0.0.0', port=10000, debug=False, use_reloader=False, threaded=True)
-import os
-
-if __name__ == "__main__":
-    # Render provides a port via environment variables
+def serve():
+    """Run the health server (blocks); run.py calls this from a daemon thread"""
+    # Render (and similar hosts) provide the port via PORT; bind 0.0.0.0 so the host can reach it
     port = int(os.environ.get("PORT", 10000))
-    # You MUST bind to 0.0.0.0 for Render to see the app
-    app.run(host='0.0.0.0', port=port)
-    
+    print(f"🌐 Flask health server starting on 0.0.0.0:{port}", flush=True)
+    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
+
+if __name__ == '__main__':
+    serve()
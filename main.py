@@ -1,4 +1,6 @@
+import html
 import logging
+import re
 import string
 import random
 import sqlite3
@@ -8,16 +10,21 @@ import time
 import subprocess
 import signal
 import sys
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple, FrozenSet, Sequence
 from datetime import datetime, timedelta
-from threading import Thread
+from threading import Thread, Lock
 import atexit
 from io import BytesIO
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from PIL import Image
 
 # Imports from the library
-from telegram import Update
+from telegram import Message, ReplyParameters, Update
+from telegram.error import RetryAfter, TelegramError
 from telegram.ext import (
     ApplicationBuilder,
+    BaseUpdateProcessor,
     ContextTypes,
     CommandHandler,
     MessageHandler,
@@ -33,11 +40,23 @@ BOT_TOKEN = os.environ.get("BOT_TOKEN", "REPLACE_WITH_TOKEN_IF_NOT_USING_SECRETS
 # Files
 DICTIONARY_FILE = "words.txt"
 DB_FILE = "wordgame_leaderboard.db"
+DB_POOL_SIZE = 8  # Idle SQLite connections kept open for reuse
+DB_PAGE_CACHE_KIB = 20000  # Per-connection SQLite page cache; pooled connections keep it warm
+DB_MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database file read through mmap
+SCHEMA_VERSION = 2  # Bump (and extend init_db's migration blocks) when columns or tables are added
+# Explicit column order for stats rows: callers index the tuple, and migrated databases may differ from a fresh schema
+PLAYER_STATS_COLUMNS = ('user_id, username, total_words, games_played, longest_word, longest_word_length, '
+                        'best_streak, total_score, average_word_length, ban_expiry, is_banned, last_daily')
+DB_CACHE_TTL = 30  # Seconds a cached per-user read (stats, balance, inventory, titles) stays valid
+DB_CACHE_MAX = 4096  # Cached reads kept before the cache is flushed
 
 # Game Settings
 TURN_TIMEOUT = 60
+COMBINE_TIMEOUT_MESSAGES = True  # Send the timeout notice and what follows it as one message
 
 # Difficulty settings
+DEFAULT_DIFFICULTY = 'medium'
+DEFAULT_GAME_MODE = 'nerd'  # 'chaos' or 'nerd'
 DIFFICULTY_MODES = {
     'easy': {'start_length': 3, 'increment_rate': 3, 'min_length': 3, 'max_length': 10},
     'medium': {'start_length': 3, 'increment_rate': 2, 'min_length': 3, 'max_length': 15},
@@ -52,6 +71,92 @@ SHOP_BOOSTS = {
     'streak': {'price': 400, 'description': '🛡️ Streak Protection - Prevent next streak reset'},
     'bal_photo': {'price': 1500, 'description': '🖼️ Custom /bal Picture - Set your own balance photo'}
 }
+# /buy_<boost> command token -> boost key (bio is sold outside SHOP_BOOSTS)
+BUY_COMMANDS = {f"/buy_{k}": k for k in (*SHOP_BOOSTS, 'bio')}
+# /shop text with %s slots for the balance and each boost's owned count (in SHOP_BOOSTS order)
+SHOP_TEMPLATE = (
+    "🛍️ <b>SHOP</b> 💰 Balance: <b>%s pts</b>\n\n"
+    + "".join(f"{d['description']}\n💵 Price: <b>{d['price']} pts</b> - Owned: <b>%s</b>\n/buy_{k}\n\n"
+              for k, d in SHOP_BOOSTS.items())
+    + "<b>🖋️ PERSONAL BIO</b>\n"
+    "└ 🏷️ Price: <code>500</code> pts | /buy_bio\n"
+    "<i>Set a custom message on your profile (Max 40 words). Access consumed on use.</i>\n\n"
+    "Example: /buy_hint to purchase hint boost"
+)
+
+# Display lookups shared by command handlers
+DIFFICULTY_EMOJI = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
+MODE_EMOJI = {'chaos': '🎲', 'nerd': '🤓'}
+
+# Start-letter pool and RNG for challenge generation
+_LETTERS = tuple(string.ascii_lowercase)
+_RAND = random.Random()
+# Turn prompts for the hot paths (HTML, %-formatted): length, upper-case letter, seconds
+TURN_TARGET = "Target: <b>exactly %d letters</b> starting with <b>'%s'</b>\n⏱️ <b>Time: %ds</b>"
+TURN_PROMPT = "👉 @%s's Turn\n" + TURN_TARGET
+REBOUND_TURN_PROMPT = "👉 @%s's Turn (SAME QUESTION)\n" + TURN_TARGET
+TIMEOUT_PRACTICE_MSG = "⏰ <b>TIME'S UP!</b>\n\n❌ You were eliminated due to timeout!\n\n(Practice mode - no points deducted)"
+TIMEOUT_REAL_MSG = "⏰ <b>TIME'S UP!</b>\n\n❌ @%s is eliminated due to timeout!\n\n<i>Forfeit - points earned before timeout still count.</i>"
+GAME_OVER_MSG = "🏆 <b>GAME OVER!</b>\n\n👑 <b>Winner:</b> @%s"
+# Static help texts (HTML), built once at import
+START_TEXT = (
+    "🎮 <b>Welcome to the KURIMUZON Word Game!</b>\n\n"
+    "📋 <b>Game Commands:</b>\n"
+    "/lobby - Open a new game lobby\n"
+    "/join - Join the lobby\n"
+    "/begin - Start the game (needs 2+ players)\n"
+    "/difficulty [easy/medium/hard] - Set difficulty\n"
+    "/forfeit - Give up your turn (-10 pts, points before forfeit count)\n"
+    "/stop - Stop the current game\n\n"
+    "💰 <b>Shop & Boosts:</b>\n"
+    "/shop - View available boosts\n"
+    "/buy_hint /buy_skip /buy_rebound - Purchase boosts\n"
+    "/hint - Get word suggestions\n"
+    "/skip_boost - Skip without penalty\n"
+    "/rebound - Skip & pass question to next player\n\n"
+    "📊 <b>Stats & Leaderboard:</b>\n"
+    "/mystats - View your personal stats\n"
+    "/leaderboard [score/words/streak/longest] - Top players\n\n"
+    "🏆 <b>Achievements & Titles:</b>\n"
+    "/achievements - View all available titles\n"
+    "/settitle [title] - Set your active title\n"
+    "/mytitle - View your current title\n\n"
+    "💡 <b>Features:</b>\n"
+    "• Streak tracking & combo bonuses\n"
+    "• Three difficulty modes\n"
+    "• Comprehensive player statistics\n"
+    "• Stylized achievement titles\n"
+)
+MODE_HELP_TEXT = (
+    "🎲 <b>CHAOS</b>\n"
+    "• Random letters each turn\n"
+    "• Random word lengths (3-12 letters)\n"
+    "• Unpredictable & chaotic\n\n"
+    "🤓 <b>NERD</b>\n"
+    "• Random letters each turn\n"
+    "• Word length increases +1 every round\n"
+    "• Starts at 3 letters\n\n"
+    "Use: /mode [chaos/nerd]"
+)
+DIFFICULTY_HELP_TEXT = (
+    "🟢 <b>Easy</b>: 3-10 letters, slower progression\n"
+    "🟡 <b>Medium</b>: 3-15 letters, moderate progression\n"
+    "🔴 <b>Hard</b>: 4-20 letters, fast progression\n\n"
+    "Use: /difficulty [easy/medium/hard]"
+)
+# Leaderboard categories (user argument -> column) and their display names
+LEADERBOARD_CATEGORIES = {
+    'score': 'total_score',
+    'words': 'total_words',
+    'streak': 'best_streak',
+    'longest': 'longest_word_length'
+}
+LEADERBOARD_CATEGORY_NAMES = {
+    'total_score': 'Total Score',
+    'total_words': 'Words Played',
+    'best_streak': 'Best Streak',
+    'longest_word_length': 'Longest Word'
+}
 
 # Game Challenge Sequence (length, letter) - cycles through
 CHALLENGE_SEQUENCE = [
@@ -65,6 +170,7 @@ CHALLENGE_SEQUENCE = [
 
 # Bot Owner (for exclusive KAMI title) - Set via environment variable or hardcode here
 BOT_OWNER_ID = int(os.environ.get("BOT_OWNER_ID", "0"))  # Set BOT_OWNER_ID env var to your Telegram user ID
+_KAMI_IDS: FrozenSet[int] = frozenset({BOT_OWNER_ID})  # Users who hold the exclusive KAMI title
 
 # Available Titles with Dynamic Requirements (Multi-Stage)
 STAGES = {
@@ -84,6 +190,61 @@ TITLES = {
     'kami': {'display': '✨ KAMI', 'exclusive': True}
 }
 
+# Precomputed (key, display) rows for the earnable (non-exclusive) titles and requirement descriptions for list renders
+NON_EXCLUSIVE_TITLE_ROWS = tuple((key, data['display']) for key, data in TITLES.items() if not data.get('exclusive'))
+TITLE_REQ_DESCS = {key: data['desc'] for key, data in TITLES.items() if 'desc' in data}
+
+# Position of each requirement stat in a get_player_stats() row
+STAT_COLUMNS = {'total_words': 2, 'games_played': 3, 'longest_word_length': 5, 'best_streak': 6, 'total_score': 7}
+SHADOW_STAGE_REQS = (3, 6, 9, 12, 15)  # Shadow: strict word lengths rather than multiples of base_req
+# Per title: (stats row column, requirement for stages 1-5)
+TITLE_STAGE_REQS = {
+    key: (STAT_COLUMNS[data['stat']],
+          SHADOW_STAGE_REQS if key == 'shadow'
+          else tuple(int(data['base_req'] * STAGES[stage]['multiplier']) for stage in range(1, 6)))
+    for key, data in TITLES.items() if 'stat' in data
+}
+
+# Profile header/border/decoration per active title
+TITLE_THEMES = {
+    'legend': {
+        'header': "👑 <b>𝐋𝐄𝐆𝐄𝐍𝐃𝐀𝐑𝐘 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 👑",
+        'border': "🌟 ━━━━━━━━━━━ 🌟",
+        'symbol': "🏆",
+        'decoration': "<i>『 The history remembers your name. 』</i>"
+    },
+    'warrior': {
+        'header': "⚔️ <b>𝐖𝐀𝐑𝐑𝐈𝐎𝐑 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> ⚔️",
+        'border': "🩸 ━━━━━━━━━━━ 🩸",
+        'symbol': "🛡️",
+        'decoration': "<i>『 Strength and honor above all. 』</i>"
+    },
+    'sage': {
+        'header': "🧙 <b>𝐒𝐀𝐆𝐄 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🧙",
+        'border': "📜 ━━━━━━━━━━━ 📜",
+        'symbol': "🔮",
+        'decoration': "<i>『 Wisdom is the ultimate weapon. 』</i>"
+    },
+    'phoenix': {
+        'header': "🔥 <b>𝐏𝐇𝐎𝐄𝐍𝐈𝐗 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🔥",
+        'border': "🌋 ━━━━━━━━━━━ 🌋",
+        'symbol': "🐦‍🔥",
+        'decoration': "<i>『 From the ashes, I shall rise. 』</i>"
+    },
+    'shadow': {
+        'header': "🌑 <b>𝐒𝐇𝐀𝐃𝐎𝐖 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🌑",
+        'border': "🕶️ ━━━━━━━━━━━ 🕶️",
+        'symbol': "🗝️",
+        'decoration': "<i>『 Silent as a whisper, deadly as night. 』</i>"
+    },
+    'kami': {
+        'header': "✨ <b>𝐃𝐈𝐕𝐈𝐍𝐄 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> ✨",
+        'border': "✦ ━━━━━━━━━━━ ✦",
+        'symbol': "🌌",
+        'decoration': "<i>『 The one neither above nor below all. 』</i>"
+    }
+}
+
 # ==========================================
 # LOGGING SETUP
 # ==========================================
@@ -96,394 +257,562 @@ logger = logging.getLogger(__name__)
 # ==========================================
 # DATABASE MANAGER (Leaderboard)
 # ==========================================
+class _PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its DatabaseManager's idle pool"""
+    manager: 'DatabaseManager'
+
+    def close(self):
+        try:
+            if self.in_transaction:
+                self.rollback()  # Never hand out a connection mid-transaction
+        except sqlite3.Error:
+            sqlite3.Connection.close(self)  # Don't pool a connection that can't roll back
+            return
+        self.manager._release(self)
+
+def _cached_read(method):
+    """Serve a per-user DatabaseManager read from its TTL cache; writers call invalidate(user_id)"""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, user_id):
+        key = (name, user_id)
+        now = time.monotonic()
+        hit = self._read_cache.get(key)
+        if hit is None or hit[0] <= now:
+            version = self._cache_versions.get(user_id, 0)
+            value = method(self, user_id)
+            # Skip storing if a write for this user landed while we were reading
+            if self._cache_versions.get(user_id, 0) == version:
+                if len(self._read_cache) >= DB_CACHE_MAX:
+                    self._read_cache.clear()
+                self._read_cache[key] = (now + DB_CACHE_TTL, value)
+        else:
+            value = hit[1]
+        # Hand out copies of mutable results so callers can't edit the cached one
+        return value.copy() if isinstance(value, (dict, list)) else value
+    return wrapper
+
+_CACHED_READS = ('get_active_title', 'get_title_stages', 'get_player_stats', 'get_inventory')
+
 class DatabaseManager:
     def __init__(self, db_name):
         self.db_name = db_name
+        self._read_cache: Dict[Tuple[str, int], Tuple[float, object]] = {}
+        self._cache_versions: Dict[int, int] = {}
+        self._pool: List[_PooledConnection] = []  # Idle connections, reused by connect()
+        self._pool_lock = Lock()
         self.init_db()
+        # Shared connection for username lookups (opened once, reused by every /profile search)
+        self._search_conn = self.connect(check_same_thread=False, isolation_level=None)
+        self._search_lock = Lock()
+        # Omnipotent grants are rare; load them once and keep the set in step in set_user_omnipotent
+        with self.connection() as conn:
+            self._omnipotent: Set[int] = {row[0] for row in conn.execute("SELECT user_id FROM permissions WHERE is_omnipotent = 1")}
+
+    def connect(self, **kwargs):
+        """Check out a pooled connection (conn.close() returns it); kwargs open a dedicated one instead"""
+        if not kwargs:
+            with self._pool_lock:
+                if self._pool:
+                    return self._pool.pop()
+            # Pooled connections may be checked out from the loop thread or a to_thread worker
+            kwargs = {'check_same_thread': False, 'factory': _PooledConnection}
+        conn = sqlite3.connect(self.db_name, **kwargs)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{DB_PAGE_CACHE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        if isinstance(conn, _PooledConnection):
+            conn.manager = self
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection for a with-block; it is rolled back if needed and released on exit"""
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()  # _PooledConnection.close rolls back an open transaction before pooling it
+
+    def invalidate(self, user_id):
+        """Drop a user's cached reads; every write to their leaderboard/inventory/titles rows calls this"""
+        self._cache_versions[user_id] = self._cache_versions.get(user_id, 0) + 1
+        for name in _CACHED_READS:
+            self._read_cache.pop((name, user_id), None)
+
+    def _release(self, conn: _PooledConnection):
+        with self._pool_lock:
+            if len(self._pool) < DB_POOL_SIZE:
+                self._pool.append(conn)
+                return
+        sqlite3.Connection.close(conn)
 
     def init_db(self):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-
-        # Removed hints_used and skips_used columns
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS leaderboard (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT,
-                total_words INTEGER DEFAULT 0,
-                games_played INTEGER DEFAULT 0,
-                longest_word TEXT DEFAULT '',
-                longest_word_length INTEGER DEFAULT 0,
-                best_streak INTEGER DEFAULT 0,
-                total_score INTEGER DEFAULT 0,
-                average_word_length REAL DEFAULT 0.0
-            )
-        ''')
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS inventory (
-                user_id INTEGER PRIMARY KEY,
-                hint_count INTEGER DEFAULT 0,
-                skip_count INTEGER DEFAULT 0,
-                rebound_count INTEGER DEFAULT 0,
-                streak_protect INTEGER DEFAULT 0,
-                balance INTEGER DEFAULT 0,
-                bal_photo_count INTEGER DEFAULT 0
-            )
-        ''')
+        with self.connection() as conn:
+            c = conn.cursor()
+            # WAL lets readers run alongside the writer; the mode sticks to the database file
+            c.execute("PRAGMA journal_mode=WAL")
+
+            # Removed hints_used and skips_used columns
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS leaderboard (
+                    user_id INTEGER PRIMARY KEY,
+                    username TEXT,
+                    total_words INTEGER DEFAULT 0,
+                    games_played INTEGER DEFAULT 0,
+                    longest_word TEXT DEFAULT '',
+                    longest_word_length INTEGER DEFAULT 0,
+                    best_streak INTEGER DEFAULT 0,
+                    total_score INTEGER DEFAULT 0,
+                    average_word_length REAL DEFAULT 0.0
+                )
+            ''')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS inventory (
+                    user_id INTEGER PRIMARY KEY,
+                    hint_count INTEGER DEFAULT 0,
+                    skip_count INTEGER DEFAULT 0,
+                    rebound_count INTEGER DEFAULT 0,
+                    streak_protect INTEGER DEFAULT 0,
+                    balance INTEGER DEFAULT 0,
+                    bal_photo_count INTEGER DEFAULT 0
+                )
+            ''')
         
-        # Migration for existing inventory table
-        try:
-            c.execute("ALTER TABLE inventory ADD COLUMN bal_photo_count INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            c.execute("ALTER TABLE leaderboard ADD COLUMN ban_expiry TEXT")
-            c.execute("ALTER TABLE leaderboard ADD COLUMN is_banned INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        # Force update NULLs to 0 to prevent "None" errors
-        try:
-            c.execute("UPDATE inventory SET bal_photo_count = 0 WHERE bal_photo_count IS NULL")
-            c.execute("UPDATE inventory SET hint_count = 0 WHERE hint_count IS NULL")
-            c.execute("UPDATE inventory SET skip_count = 0 WHERE skip_count IS NULL")
-            c.execute("UPDATE inventory SET rebound_count = 0 WHERE rebound_count IS NULL")
-            c.execute("UPDATE inventory SET streak_protect = 0 WHERE streak_protect IS NULL")
-            c.execute("UPDATE inventory SET balance = 0 WHERE balance IS NULL")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            c.execute("ALTER TABLE leaderboard ADD COLUMN last_daily TEXT")
-        except sqlite3.OperationalError:
-            pass
+            # Create titles table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS titles (
+                    user_id INTEGER PRIMARY KEY,
+                    active_title TEXT DEFAULT '',
+                    unlocked_titles TEXT DEFAULT '',
+                    bio TEXT DEFAULT '',
+                    has_bio_access INTEGER DEFAULT 0,
+                    custom_bal_photo_id TEXT DEFAULT '',
+                    has_bal_photo_access INTEGER DEFAULT 0
+                )
+            ''')
+
+            # Column migrations and NULL clean-up run once per database, tracked in PRAGMA user_version
+            c.execute("PRAGMA user_version")
+            schema_version = c.fetchone()[0]
+            if schema_version < 1:
+                for table, column in (
+                    ('inventory', 'bal_photo_count INTEGER DEFAULT 0'),
+                    ('leaderboard', 'ban_expiry TEXT'),
+                    ('leaderboard', 'is_banned INTEGER DEFAULT 0'),
+                    ('leaderboard', 'last_daily TEXT'),
+                    ('titles', "custom_bal_photo_id TEXT DEFAULT ''"),
+                    ('titles', 'has_bal_photo_access INTEGER DEFAULT 0'),
+                ):
+                    try:
+                        c.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+                    except sqlite3.OperationalError:
+                        pass  # Column already present
+
+                # Force update NULLs to 0 to prevent "None" errors
+                c.execute('''UPDATE inventory SET
+                    bal_photo_count = COALESCE(bal_photo_count, 0), hint_count = COALESCE(hint_count, 0),
+                    skip_count = COALESCE(skip_count, 0), rebound_count = COALESCE(rebound_count, 0),
+                    streak_protect = COALESCE(streak_protect, 0), balance = COALESCE(balance, 0)
+                    WHERE bal_photo_count IS NULL OR hint_count IS NULL OR skip_count IS NULL
+                       OR rebound_count IS NULL OR streak_protect IS NULL OR balance IS NULL''')
+
+            # Create chat_members table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS chat_members (
+                    chat_id INTEGER,
+                    user_id INTEGER,
+                    username TEXT,
+                    PRIMARY KEY (chat_id, user_id)
+                )
+            ''')
         
-        # Create titles table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS titles (
-                user_id INTEGER PRIMARY KEY,
-                active_title TEXT DEFAULT '',
-                unlocked_titles TEXT DEFAULT '',
-                bio TEXT DEFAULT '',
-                has_bio_access INTEGER DEFAULT 0,
-                custom_bal_photo_id TEXT DEFAULT '',
-                has_bal_photo_access INTEGER DEFAULT 0
-            )
-        ''')
+            # Create permissions table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS permissions (
+                    user_id INTEGER PRIMARY KEY,
+                    is_omnipotent INTEGER DEFAULT 0
+                )
+            ''')
+
+            # One row per unlocked title; replaces the comma-joined titles.unlocked_titles string
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS title_stages (
+                    user_id INTEGER,
+                    title_key TEXT,
+                    stage INTEGER,
+                    PRIMARY KEY (user_id, title_key)
+                )
+            ''')
+            if schema_version < 2:
+                # One-shot migration of the legacy "title:stage,title" strings
+                c.execute("SELECT user_id, unlocked_titles FROM titles WHERE unlocked_titles != ''")
+                rows = []
+                for user_id, unlocked in c.fetchall():
+                    for entry in (unlocked or '').split(','):
+                        k, _, stage = entry.partition(":")
+                        if k:
+                            rows.append((user_id, k, int(stage) if stage.isdigit() else 1))
+                c.executemany('''INSERT INTO title_stages (user_id, title_key, stage) VALUES (?, ?, ?)
+                    ON CONFLICT(user_id, title_key) DO UPDATE SET stage = MAX(stage, excluded.stage)''', rows)
+                # Titles used to unlock only when /profile was opened; grant what existing stats already earn
+                c.execute("SELECT user_id, title_key, stage FROM title_stages")
+                held: Dict[int, Dict[str, int]] = {}
+                for user_id, k, stage in c.fetchall():
+                    held.setdefault(user_id, {})[k] = stage
+                c.execute(f"SELECT {PLAYER_STATS_COLUMNS} FROM leaderboard")
+                for stats in c.fetchall():
+                    newly_unlocked = self._qualifying_stages(stats[0], stats, held.get(stats[0], {}))
+                    if newly_unlocked:
+                        self._write_title_stages(c, stats[0], newly_unlocked)
+
+            # Expression index so exact username lookups skip the full-table LOWER/TRIM scan
+            c.execute("CREATE INDEX IF NOT EXISTS idx_username_norm ON leaderboard(LOWER(TRIM(username)))")
+            # Covering indexes per leaderboard category: ORDER BY ... LIMIT and rank counts read the index
+            # alone (no sort, no table lookups)
+            for col in LEADERBOARD_CATEGORIES.values():
+                c.execute(f"CREATE INDEX IF NOT EXISTS idx_lb_{col}_cover ON leaderboard({col} DESC, user_id, username)")
+
+            if schema_version < SCHEMA_VERSION:
+                # Gather planner statistics once per migration so SQLite picks the indexes above
+                c.execute("ANALYZE")
+                c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-        # Migration for existing titles table
-        try:
-            c.execute("ALTER TABLE titles ADD COLUMN custom_bal_photo_id TEXT DEFAULT ''")
-        except sqlite3.OperationalError:
-            pass
-        try:
-            c.execute("ALTER TABLE titles ADD COLUMN has_bal_photo_access INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        # Create chat_members table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS chat_members (
-                chat_id INTEGER,
-                user_id INTEGER,
-                username TEXT,
-                PRIMARY KEY (chat_id, user_id)
-            )
-        ''')
-        
-        # Create permissions table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS permissions (
-                user_id INTEGER PRIMARY KEY,
-                is_omnipotent INTEGER DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+            conn.commit()
     
+    @_cached_read
     def get_active_title(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT active_title FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT active_title FROM titles WHERE user_id=?", (user_id,))
+            result = c.fetchone()
         return result[0] if result else ''
     
     def set_active_title(self, user_id, title):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM titles WHERE user_id=?", (user_id,))
-        if not c.fetchone():
-            c.execute("INSERT INTO titles (user_id, active_title) VALUES (?, ?)", (user_id, title))
-        else:
-            c.execute("UPDATE titles SET active_title = ? WHERE user_id=?", (title, user_id))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute('''INSERT INTO titles (user_id, active_title) VALUES (?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET active_title = excluded.active_title''', (user_id, title))
+            conn.commit()
+        self.invalidate(user_id)
     
     def unlock_title(self, user_id, title):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT unlocked_titles FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        if not result:
-            c.execute("INSERT INTO titles (user_id, unlocked_titles) VALUES (?, ?)", (user_id, title))
-        else:
-            unlocked = set(result[0].split(',')) if result[0] else set()
-            unlocked.add(title)
-            c.execute("UPDATE titles SET unlocked_titles = ? WHERE user_id=?", (','.join(unlocked), user_id))
-        conn.commit()
-        conn.close()
-    
-    def get_unlocked_titles(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT unlocked_titles FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
-        # Format: "title:stage,title:stage"
-        return result[0].split(',') if result and result[0] else []
+        self.unlock_title_stage(user_id, title, 1, only_raise=True)
+
+    @_cached_read
+    def get_title_stages(self, user_id):
+        """Unlocked titles as {title_key: highest stage}"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT title_key, stage FROM title_stages WHERE user_id=?", (user_id,))
+            result = dict(c.fetchall())
+        return result
     
     def get_title_stage(self, user_id, title_key):
-        unlocked = self.get_unlocked_titles(user_id)
-        max_stage = 0
-        for entry in unlocked:
-            if ':' in entry:
-                k, s = entry.split(':')
-                if k == title_key:
-                    max_stage = max(max_stage, int(s))
-            elif entry == title_key:
-                max_stage = max(max_stage, 1)
-        return max_stage
-
-    def unlock_title_stage(self, user_id, title_key, stage):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        unlocked = self.get_unlocked_titles(user_id)
-        
-        # Update or add
-        new_unlocked = []
-        found = False
-        for entry in unlocked:
-            k = entry.split(':')[0] if ':' in entry else entry
-            
-            if k == title_key:
-                new_unlocked.append(f"{title_key}:{stage}")
-                found = True
-            else:
-                new_unlocked.append(entry)
-        
-        if not found:
-            new_unlocked.append(f"{title_key}:{stage}")
-            
-        c.execute("UPDATE titles SET unlocked_titles = ? WHERE user_id=?", (','.join(new_unlocked), user_id))
-        conn.commit()
-        conn.close()
+        return self.get_title_stages(user_id).get(title_key, 0)
+
+    def unlock_title_stage(self, user_id, title_key, stage, only_raise=False):
+        with self.connection() as conn:
+            c = conn.cursor()
+            new_stage = "MAX(stage, excluded.stage)" if only_raise else "excluded.stage"
+            c.execute(f'''INSERT INTO title_stages (user_id, title_key, stage) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, title_key) DO UPDATE SET stage = {new_stage}''', (user_id, title_key, stage))
+            conn.commit()
+        self.invalidate(user_id)
 
-    def check_title_unlock(self, user_id, title_key, stage=1):
+    def check_title_unlock(self, user_id, title_key, stage=1, stats=None):
         if title_key == 'kami':
-            return user_id == BOT_OWNER_ID
+            return user_id in _KAMI_IDS
         
-        if title_key not in TITLES:
+        if title_key not in TITLE_STAGE_REQS:
             return False
             
-        stats = self.get_player_stats(user_id)
+        if stats is None:
+            stats = self.get_player_stats(user_id)
         if not stats:
             return False
             
-        title_data = TITLES[title_key]
-        
-        # stats mapping: 2: total_words, 3: games_played, 5: longest_word_length, 6: best_streak, 7: total_score
-        stat_map = {
-            'total_words': stats[2],
-            'games_played': stats[3],
-            'longest_word_length': stats[5],
-            'best_streak': stats[6],
-            'total_score': stats[7]
-        }
-        
-        # Shadow Special Logic: Strict 3/6/9/12/15 word length
-        if title_key == 'shadow':
-            shadow_reqs = {1: 3, 2: 6, 3: 9, 4: 12, 5: 15}
-            req_val = shadow_reqs.get(stage, 15)
-            return stat_map['longest_word_length'] >= req_val
-            
-        req_val = int(title_data['base_req'] * STAGES[stage]['multiplier'])
-        return stat_map.get(title_data['stat'], 0) >= req_val
-    
-    def auto_unlock_titles(self, user_id):
+        column, reqs = TITLE_STAGE_REQS[title_key]
+        return (stats[column] or 0) >= reqs[stage - 1]
+    
+    def auto_unlock_titles(self, user_id, stats=None):
+        """Unlock every stage the player now qualifies for in one write; returns [(title_key, stage)]"""
+        if stats is None:
+            stats = self.get_player_stats(user_id)
+        newly_unlocked = self._qualifying_stages(user_id, stats, self.get_title_stages(user_id))
+        if newly_unlocked:
+            with self.connection() as conn:
+                c = conn.cursor()
+                self._write_title_stages(c, user_id, newly_unlocked)
+                conn.commit()
+            self.invalidate(user_id)
+        return newly_unlocked
+
+    def _qualifying_stages(self, user_id, stats, stages):
+        """(title_key, stage) pairs the stats row now meets beyond the stages already held"""
         newly_unlocked = []
-        for title_key, title_data in TITLES.items():
+        if not stats:
+            return newly_unlocked
+        for title_key in TITLES:
             if title_key == 'kami': continue
-            
-            current_stage = self.get_title_stage(user_id, title_key)
-            for stage in range(current_stage + 1, 6):
-                if self.check_title_unlock(user_id, title_key, stage):
-                    self.unlock_title_stage(user_id, title_key, stage)
-                    newly_unlocked.append((title_key, stage))
-                else:
+            for stage in range(stages.get(title_key, 0) + 1, 6):
+                if not self.check_title_unlock(user_id, title_key, stage, stats):
                     break
+                newly_unlocked.append((title_key, stage))
         return newly_unlocked
 
-    def update_word_stats(self, user_id, username, word, streak=0, forfeit=False):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-
-        # Update username in both tables to ensure profile sync
-        c.execute("UPDATE leaderboard SET username = ? WHERE user_id = ?", (username, user_id))
-        c.execute("UPDATE chat_members SET username = ? WHERE user_id = ?", (username, user_id))
-
-        c.execute("SELECT * FROM leaderboard WHERE user_id=?", (user_id,))
-        entry = c.fetchone()
+    def _write_title_stages(self, c, user_id, newly_unlocked):
+        c.executemany('''INSERT INTO title_stages (user_id, title_key, stage) VALUES (?, ?, ?)
+            ON CONFLICT(user_id, title_key) DO UPDATE SET stage = MAX(stage, excluded.stage)''',
+            [(user_id, title_key, stage) for title_key, stage in newly_unlocked])
 
+    def update_word_stats(self, user_id, username, word, streak=0, forfeit=False):
         if forfeit:
-            if entry:
-                total_score = max(0, entry[7] - 10)
-                c.execute('''UPDATE leaderboard SET 
-                    total_score = ?
-                    WHERE user_id=?''', (total_score, user_id))
+            with self.connection() as conn:
+                c = conn.cursor()
+                self._write_word_stats(c, user_id, username, word, streak, forfeit)
+                conn.commit()
+            self.invalidate(user_id)
+            return []
+        return self.update_word_stats_batch([(user_id, username, word, streak)])[user_id]
+
+    def update_word_stats_batch(self, entries):
+        """Record queued (user_id, username, word, streak) turns - stats, balance and title unlocks - in one transaction
+
+        Returns {user_id: newly unlocked [(title_key, stage)]}.
+        """
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            latest_stats = {}
+            for user_id, username, word, streak in entries:
+                # The upsert RETURNs the merged row, so the title check below needs no re-read
+                latest_stats[user_id] = self._write_word_stats(c, user_id, username, word, streak)
+            unlocked = {}
+            for user_id, stats in latest_stats.items():
+                c.execute("SELECT title_key, stage FROM title_stages WHERE user_id=?", (user_id,))
+                stages = dict(c.fetchall())
+                unlocked[user_id] = self._qualifying_stages(user_id, stats, stages)
+                if unlocked[user_id]:
+                    self._write_title_stages(c, user_id, unlocked[user_id])
             conn.commit()
-            conn.close()
+        for user_id in unlocked:
+            self.invalidate(user_id)
+        return unlocked
+
+    def _write_word_stats(self, c, user_id, username, word, streak=0, forfeit=False):
+        if forfeit:
+            c.execute("UPDATE leaderboard SET username = ?, total_score = MAX(0, total_score - 10) WHERE user_id=?",
+                      (username, user_id))
             return
 
-        if entry:
-            total_words = entry[2] + 1
-            longest_word = entry[4] if len(entry[4]) > len(word) else word
-            longest_word_length = max(entry[5], len(word))
-            best_streak = max(entry[6], streak)
-            total_score = entry[7] + len(word)
-            avg_word_length = ((entry[8] * entry[2]) + len(word)) / total_words
-
-            c.execute('''UPDATE leaderboard SET 
-                username = ?, total_words = ?, longest_word = ?, 
-                longest_word_length = ?, best_streak = ?, total_score = ?,
-                average_word_length = ?
-                WHERE user_id=?''', 
-                (username, total_words, longest_word, longest_word_length, 
-                 best_streak, total_score, avg_word_length, user_id))
-        else:
-            c.execute('''INSERT INTO leaderboard 
-                (user_id, username, total_words, longest_word, longest_word_length, 
-                 best_streak, total_score, average_word_length) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', 
-                (user_id, username, 1, word, len(word), streak, len(word), float(len(word))))
+        # One upsert per table; on conflict every column expression reads the row's old values
+        n = len(word)
+        c.execute('''INSERT INTO leaderboard 
+            (user_id, username, total_words, longest_word, longest_word_length, 
+             best_streak, total_score, average_word_length) 
+            VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                username = excluded.username,
+                total_words = total_words + 1,
+                longest_word = CASE WHEN length(longest_word) > excluded.longest_word_length
+                                    THEN longest_word ELSE excluded.longest_word END,
+                longest_word_length = MAX(longest_word_length, excluded.longest_word_length),
+                best_streak = MAX(best_streak, excluded.best_streak),
+                total_score = total_score + excluded.total_score,
+                average_word_length = (average_word_length * total_words + excluded.longest_word_length) / (total_words + 1)
+            RETURNING ''' + PLAYER_STATS_COLUMNS,
+            (user_id, username, word, n, streak, n, float(n)))
+        stats = c.fetchone()
 
         # Add points to shop balance (currency)
-        c.execute("SELECT * FROM inventory WHERE user_id=?", (user_id,))
-        if not c.fetchone():
-            c.execute("INSERT INTO inventory (user_id, balance) VALUES (?, ?)", (user_id, len(word)))
-        else:
-            c.execute("UPDATE inventory SET balance = balance + ? WHERE user_id=?", (len(word), user_id))
-
-        conn.commit()
-        conn.close()
-        
-        # Auto-unlock titles immediately after word submission
-        self.auto_unlock_titles(user_id)
+        c.execute('''INSERT INTO inventory (user_id, balance) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance''', (user_id, n))
+        return stats
 
     def is_user_omnipotent(self, user_id):
         """Check if user has omnipotent permissions"""
-        if user_id == BOT_OWNER_ID: return True
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT is_omnipotent FROM permissions WHERE user_id = ?", (user_id,))
-        result = c.fetchone()
-        conn.close()
-        return result[0] == 1 if result else False
+        return user_id == BOT_OWNER_ID or user_id in self._omnipotent
 
     def set_user_omnipotent(self, user_id, status: bool):
         """Grant or revoke omnipotent permissions"""
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO permissions (user_id, is_omnipotent) VALUES (?, ?)", 
-                 (user_id, 1 if status else 0))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("INSERT OR REPLACE INTO permissions (user_id, is_omnipotent) VALUES (?, ?)", 
+                     (user_id, 1 if status else 0))
+            conn.commit()
+        if status:
+            self._omnipotent.add(user_id)
+        else:
+            self._omnipotent.discard(user_id)
 
     def add_balance(self, user_id, amount):
         """Add points to user's shop balance (Currency only)"""
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
+        with self.connection() as conn:
+            c = conn.cursor()
         
-        # Update inventory balance
-        c.execute("SELECT * FROM inventory WHERE user_id=?", (user_id,))
-        if not c.fetchone():
-            c.execute("INSERT INTO inventory (user_id, balance) VALUES (?, ?)", (user_id, amount))
-        else:
-            c.execute("UPDATE inventory SET balance = balance + ? WHERE user_id=?", (amount, user_id))
-            
-        conn.commit()
-        conn.close()
+            # Update inventory balance
+            c.execute('''INSERT INTO inventory (user_id, balance) VALUES (?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance''', (user_id, amount))
+            conn.commit()
+        self.invalidate(user_id)
+
+    def transfer_balance(self, from_id, to_id, amount, to_name):
+        """Move shop points between users in one transaction; False (nothing written) if funds are short"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            c.execute("UPDATE inventory SET balance = balance - ? WHERE user_id=? AND balance >= ?",
+                      (amount, from_id, amount))
+            if c.rowcount == 0:
+                conn.rollback()
+                return False
+            c.execute('''INSERT INTO inventory (user_id, balance) VALUES (?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance''', (to_id, amount))
+            c.execute('''INSERT INTO leaderboard 
+                (user_id, username, total_words, total_score, average_word_length) 
+                VALUES (?, ?, 0, 0, 0.0) ON CONFLICT(user_id) DO NOTHING''', (to_id, to_name))
+            conn.commit()
+        self.invalidate(from_id)
+        self.invalidate(to_id)
+        return True
 
     def ensure_player_exists(self, user_id, username):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM leaderboard WHERE user_id=?", (user_id,))
-        if not c.fetchone():
-            c.execute('''INSERT INTO leaderboard 
+        self.ensure_players_exist([(user_id, username)])
+
+    def ensure_players_exist(self, rows: Sequence[Tuple[int, str]]):
+        """Create missing leaderboard rows for (user_id, username) pairs in one transaction"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.executemany('''INSERT INTO leaderboard 
                 (user_id, username, total_words, total_score, average_word_length) 
-                VALUES (?, ?, 0, 0, 0.0)''', (user_id, username))
+                VALUES (?, ?, 0, 0, 0.0) ON CONFLICT(user_id) DO NOTHING''', rows)
+            conn.commit()
+        for user_id, _ in rows:
+            self.invalidate(user_id)
+
+    def upsert_chat_members(self, rows: Sequence[Tuple[int, int, str]]):
+        """Record the latest (chat_id, user_id, username) seen per member in one transaction"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.executemany("INSERT OR REPLACE INTO chat_members (chat_id, user_id, username) VALUES (?, ?, ?)", rows)
             conn.commit()
-        conn.close()
+
+    def get_chat_member_tags(self, chat_id):
+        """Sorted, de-duplicated mention tags for every member seen in a chat"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            # @usernames and stored mention links are used as-is; bare names (old data) become mention links
+            c.execute('''SELECT DISTINCT CASE
+                    WHEN substr(username, 1, 1) = '@' OR instr(username, '<a href=') > 0 THEN username
+                    ELSE '<a href="tg://user?id=' || user_id || '">' || username || '</a>'
+                END AS tag
+                FROM chat_members WHERE chat_id = ? AND username IS NOT NULL AND username != ''
+                ORDER BY tag''', (chat_id,))
+            tags = [row[0] for row in c.fetchall()]
+        return tags
+
+    def find_user_by_name(self, query):
+        """Return (user_id, username) for an exact, then partial, case-insensitive username match"""
+        with self._search_lock:
+            c = self._search_conn.cursor()
+            # Try exact match first (served by idx_username_norm)
+            c.execute("SELECT user_id, username FROM leaderboard WHERE LOWER(TRIM(username)) = ? LIMIT 1", (query,))
+            result = c.fetchone()
+            # Try partial match (for partial names and nicknames)
+            if not result:
+                c.execute("SELECT user_id, username FROM leaderboard WHERE LOWER(TRIM(username)) LIKE ? LIMIT 1", (f"%{query}%",))
+                result = c.fetchone()
+            return result
+
+    def get_all_user_ids(self) -> Set[int]:
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT user_id FROM leaderboard")
+            user_ids = {row[0] for row in c}
+        return user_ids
     
     def increment_games_played(self, user_id):
         """Increment games_played counter when a game is completed"""
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM leaderboard WHERE user_id=?", (user_id,))
-        entry = c.fetchone()
-        
-        if entry:
-            new_games_played = entry[3] + 1
-            c.execute("UPDATE leaderboard SET games_played = ? WHERE user_id=?", 
-                     (new_games_played, user_id))
-        else:
-            c.execute("INSERT INTO leaderboard (user_id, games_played) VALUES (?, 1)", 
-                     (user_id,))
-        
-        conn.commit()
-        conn.close()
+        self.increment_games_played_bulk((user_id,))
+
+    def increment_games_played_bulk(self, user_ids: Sequence[int]):
+        """Increment games_played for every player of a finished game, unlocking any titles it earns, in one transaction"""
+        if not user_ids:
+            return
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            for uid in user_ids:
+                c.execute(f'''INSERT INTO leaderboard (user_id, games_played) VALUES (?, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET games_played = games_played + 1
+                    RETURNING {PLAYER_STATS_COLUMNS}''', (uid,))
+                stats = c.fetchone()
+                c.execute("SELECT title_key, stage FROM title_stages WHERE user_id=?", (uid,))
+                newly_unlocked = self._qualifying_stages(uid, stats, dict(c.fetchall()))
+                if newly_unlocked:
+                    self._write_title_stages(c, uid, newly_unlocked)
+            conn.commit()
+        for uid in user_ids:
+            self.invalidate(uid)
 
     def get_top_players(self, category='total_score', limit=10):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
+        with self.connection() as conn:
+            c = conn.cursor()
 
-        valid_categories = ['total_score', 'total_words', 'longest_word_length', 'best_streak']
-        if category not in valid_categories:
-            category = 'total_score'
+            valid_categories = ['total_score', 'total_words', 'longest_word_length', 'best_streak']
+            if category not in valid_categories:
+                category = 'total_score'
 
-        c.execute(f"SELECT username, {category} FROM leaderboard ORDER BY {category} DESC LIMIT ?", (limit,))
-        data = c.fetchall()
-        conn.close()
+            c.execute(f"SELECT username, {category} FROM leaderboard ORDER BY {category} DESC LIMIT ?", (limit,))
+            data = c.fetchall()
         return data
 
+    def get_leaderboard_page(self, category, user_id, page_size=10):
+        """Return (user_rank or None, start_idx, total_players, rows) for the page holding the user.
+
+        Rank and page are computed in SQL (ties broken by user_id) so only one page of rows is fetched.
+        """
+        if category not in LEADERBOARD_CATEGORIES.values():
+            category = 'total_score'
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT COUNT(*) FROM leaderboard")
+            total = c.fetchone()[0]
+            c.execute(f"SELECT {category} FROM leaderboard WHERE user_id=?", (user_id,))
+            row = c.fetchone()
+            user_rank = None
+            if row is not None:
+                c.execute(f"SELECT COUNT(*) FROM leaderboard WHERE {category} > ? OR ({category} = ? AND user_id < ?)",
+                          (row[0], row[0], user_id))
+                user_rank = c.fetchone()[0] + 1
+            start_idx = (user_rank - 1) // page_size * page_size if user_rank else 0
+            c.execute(f"SELECT user_id, username, {category} FROM leaderboard ORDER BY {category} DESC, user_id LIMIT ? OFFSET ?",
+                      (page_size, start_idx))
+            rows = c.fetchall()
+        return user_rank, start_idx, total, rows
+
+    @_cached_read
     def get_player_stats(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM leaderboard WHERE user_id=?", (user_id,))
-        data = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute(f"SELECT {PLAYER_STATS_COLUMNS} FROM leaderboard WHERE user_id=?", (user_id,))
+            data = c.fetchone()
         return data
     
     def get_balance(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT balance FROM inventory WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
-        return result[0] if result else 0
+        """Balance from the (cached) inventory row, so balance and boosts share one query"""
+        return self.get_inventory(user_id)['balance']
 
     def is_user_banned(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT is_banned, ban_expiry FROM leaderboard WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
-        if not result or not result[0]:
+        # Read through the cached stats row (ban/unban invalidate it), so per-message checks skip SQL
+        stats = self.get_player_stats(user_id)
+        if not stats or not stats[10]:
             return False, None
         
-        expiry_str = result[1]
+        expiry_str = stats[9]
         if not expiry_str: # Permanent ban
             return True, None
             
@@ -495,53 +824,52 @@ class DatabaseManager:
         return True, expiry
 
     def ban_user(self, user_id, minutes=None):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        expiry = None
-        if minutes:
-            expiry = (datetime.now() + timedelta(minutes=minutes)).isoformat()
+        with self.connection() as conn:
+            c = conn.cursor()
+            expiry = None
+            if minutes:
+                expiry = (datetime.now() + timedelta(minutes=minutes)).isoformat()
         
-        c.execute("UPDATE leaderboard SET is_banned = 1, ban_expiry = ? WHERE user_id = ?", (expiry, user_id))
-        conn.commit()
-        conn.close()
+            c.execute("UPDATE leaderboard SET is_banned = 1, ban_expiry = ? WHERE user_id = ?", (expiry, user_id))
+            conn.commit()
+        self.invalidate(user_id)
 
     def unban_user(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("UPDATE leaderboard SET is_banned = 0, ban_expiry = NULL WHERE user_id = ?", (user_id,))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("UPDATE leaderboard SET is_banned = 0, ban_expiry = NULL WHERE user_id = ?", (user_id,))
+            conn.commit()
+        self.invalidate(user_id)
 
     def deduct_balance(self, user_id, amount):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("UPDATE inventory SET balance = balance - ? WHERE user_id = ? AND balance >= ?", (amount, user_id, amount))
-        success = c.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("UPDATE inventory SET balance = balance - ? WHERE user_id = ? AND balance >= ?", (amount, user_id, amount))
+            success = c.rowcount > 0
+            conn.commit()
+        self.invalidate(user_id)
         return success
 
     def get_player_last_daily(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT last_daily FROM leaderboard WHERE user_id = ?", (user_id,))
-        row = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT last_daily FROM leaderboard WHERE user_id = ?", (user_id,))
+            row = c.fetchone()
         return row[0] if row else None
 
     def update_player_last_daily(self, user_id, date_str):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("UPDATE leaderboard SET last_daily = ? WHERE user_id = ?", (date_str, user_id))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("UPDATE leaderboard SET last_daily = ? WHERE user_id = ?", (date_str, user_id))
+            conn.commit()
+        self.invalidate(user_id)
 
+    @_cached_read
     def get_inventory(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT hint_count, skip_count, rebound_count, balance, streak_protect, bal_photo_count FROM inventory WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT hint_count, skip_count, rebound_count, balance, streak_protect, bal_photo_count FROM inventory WHERE user_id=?", (user_id,))
+            result = c.fetchone()
         if result: 
             return {
                 'hint': result[0] or 0, 
@@ -555,130 +883,172 @@ class DatabaseManager:
         return {'hint': 0, 'skip': 0, 'rebound': 0, 'streak': 0, 'streak_protect': 0, 'bal_photo': 0, 'balance': 0}
     
     def buy_boost(self, user_id, boost_type, price):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        
-        # Check balance
-        c.execute("SELECT balance FROM inventory WHERE user_id=?", (user_id,))
-        res = c.fetchone()
-        if not res or res[0] < price:
-            conn.close()
-            return False
-            
-        # Deduct balance
-        c.execute("UPDATE inventory SET balance = balance - ? WHERE user_id=?", (price, user_id))
+        with self.connection() as conn:
+            c = conn.cursor()
         
-        # Add to inventory (except for one-time access items like bio and bal_photo)
-        if boost_type not in ['bio', 'bal_photo']:
-            col_map = {
+            # Deduct balance and add to inventory in one conditional statement (one-time access items
+            # like bio and bal_photo only deduct here); a missing row or short balance updates nothing
+            col = {
                 'hint': 'hint_count',
                 'skip': 'skip_count',
                 'rebound': 'rebound_count',
                 'streak': 'streak_protect'
-            }
-            col = col_map.get(boost_type)
-            if col:
-                c.execute(f"UPDATE inventory SET {col} = {col} + 1 WHERE user_id=?", (user_id,))
-        elif boost_type == 'bio':
-            # Ensure titles record exists
-            c.execute("SELECT user_id FROM titles WHERE user_id=?", (user_id,))
-            if not c.fetchone():
-                c.execute("INSERT INTO titles (user_id, has_bio_access) VALUES (?, 1)", (user_id,))
-            else:
-                c.execute("UPDATE titles SET has_bio_access = 1 WHERE user_id=?", (user_id,))
-        elif boost_type == 'bal_photo':
-            # Fix: Ensure record exists and update license
-            c.execute("SELECT user_id FROM titles WHERE user_id=?", (user_id,))
-            if not c.fetchone():
-                c.execute("INSERT INTO titles (user_id, has_bal_photo_access) VALUES (?, 1)", (user_id,))
-            else:
-                c.execute("UPDATE titles SET has_bal_photo_access = 1 WHERE user_id=?", (user_id,))
+            }.get(boost_type)
+            grant = f", {col} = {col} + 1" if col else ""
+            c.execute(f"UPDATE inventory SET balance = balance - ?{grant} WHERE user_id=? AND balance >= ?",
+                      (price, user_id, price))
+            if c.rowcount == 0:
+                return False
+
+            if boost_type in ('bio', 'bal_photo'):
+                access = 'has_bio_access' if boost_type == 'bio' else 'has_bal_photo_access'
+                c.execute(f"INSERT INTO titles (user_id, {access}) VALUES (?, 1) ON CONFLICT(user_id) DO UPDATE SET {access} = 1",
+                          (user_id,))
         
-        conn.commit()
-        conn.close()
+            conn.commit()
+        self.invalidate(user_id)
         return True
     
     def use_boost(self, user_id, boost_type):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
+        with self.connection() as conn:
+            c = conn.cursor()
         
-        col_map = {
-            'hint': 'hint_count',
-            'skip': 'skip_count',
-            'rebound': 'rebound_count',
-            'streak_protect': 'streak_protect'
-        }
-        col = col_map.get(boost_type, f"{boost_type}_count")
+            col_map = {
+                'hint': 'hint_count',
+                'skip': 'skip_count',
+                'rebound': 'rebound_count',
+                'streak_protect': 'streak_protect'
+            }
+            col = col_map.get(boost_type, f"{boost_type}_count")
         
-        c.execute(f"UPDATE inventory SET {col} = {col} - 1 WHERE user_id=?", (user_id,))
-        conn.commit()
-        conn.close()
-    
+            c.execute(f"UPDATE inventory SET {col} = {col} - 1 WHERE user_id=?", (user_id,))
+            conn.commit()
+        self.invalidate(user_id)
+    
+    def reset_user(self, user_id):
+        """Delete a player's stats, inventory and titles in one transaction (permissions are kept)"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM leaderboard WHERE user_id=?", (user_id,))
+            c.execute("DELETE FROM inventory WHERE user_id=?", (user_id,))
+            c.execute("DELETE FROM titles WHERE user_id=?", (user_id,))
+            c.execute("DELETE FROM title_stages WHERE user_id=?", (user_id,))
+            conn.commit()
+        self.invalidate(user_id)
+
     def get_custom_bal_photo(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT custom_bal_photo_id FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT custom_bal_photo_id FROM titles WHERE user_id=?", (user_id,))
+            result = c.fetchone()
         return result[0] if result and result[0] else None
 
-    def set_custom_bal_photo(self, user_id, file_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("UPDATE titles SET custom_bal_photo_id = ?, has_bal_photo_access = 0 WHERE user_id=?", (file_id, user_id))
-        if c.rowcount == 0:
-            c.execute("INSERT INTO titles (user_id, custom_bal_photo_id, has_bal_photo_access) VALUES (?, ?, 0)", (user_id, file_id))
-        conn.commit()
-        conn.close()
+    def set_custom_bal_photo(self, user_id, file_id, keep_access=False):
+        """Store the /bal photo; the access license is consumed unless keep_access is set"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute('''INSERT INTO titles (user_id, custom_bal_photo_id, has_bal_photo_access) VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET custom_bal_photo_id = excluded.custom_bal_photo_id,
+                    has_bal_photo_access = excluded.has_bal_photo_access''',
+                (user_id, file_id, 1 if keep_access else 0))
+            conn.commit()
+        self.invalidate(user_id)
 
     def has_bal_photo_access(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT has_bal_photo_access FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT has_bal_photo_access FROM titles WHERE user_id=?", (user_id,))
+            result = c.fetchone()
         return result[0] if result else 0
 
     def get_bio(self, user_id):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("SELECT bio, has_bio_access FROM titles WHERE user_id=?", (user_id,))
-        result = c.fetchone()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT bio, has_bio_access FROM titles WHERE user_id=?", (user_id,))
+            result = c.fetchone()
         return result if result else (None, 0)
 
     def set_bio(self, user_id, bio_text):
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
-        c.execute("UPDATE titles SET bio = ?, has_bio_access = 0 WHERE user_id=?", (bio_text, user_id))
-        if c.rowcount == 0:
-            c.execute("INSERT INTO titles (user_id, bio, has_bio_access) VALUES (?, ?, 0)", (user_id, bio_text))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            c = conn.cursor()
+            c.execute('''INSERT INTO titles (user_id, bio, has_bio_access) VALUES (?, ?, 0)
+                ON CONFLICT(user_id) DO UPDATE SET bio = excluded.bio, has_bio_access = 0''', (user_id, bio_text))
+            conn.commit()
+        self.invalidate(user_id)
 
 # ==========================================
 # GAME LOGIC
 # ==========================================
+FALLBACK_WORDS = (
+    "cat", "dog", "bat", "rat", "hat", "mat", "sat", "pat",
+    "bird", "word", "nerd", "curd", "herd", "blue", "glue",
+    "apple", "board", "chair", "dance", "eagle", "fruit",
+    "banana", "friend", "orange", "purple", "school",
+    "elephant", "giraffe", "internet", "keyboard",
+)
+
+def load_dictionary() -> FrozenSet[str]:
+    """Read the word list once per process; every game shares the result"""
+    if os.path.exists(DICTIONARY_FILE):
+        try:
+            with open(DICTIONARY_FILE, 'rb') as f:
+                # Raw bytes skip the text layer's newline translation; then one decode, lower() and C-level split
+                words = frozenset(f.read().decode('utf-8').lower().split())
+            logger.info(f"Loaded {len(words)} words from {DICTIONARY_FILE}")
+            return words
+        except Exception as e:
+            logger.error(f"Error loading dictionary: {e}")
+    else:
+        logger.warning("Dictionary file not found. Using fallback list.")
+    return frozenset(FALLBACK_WORDS)
+
+def build_word_index(words) -> Dict[Tuple[str, int], Tuple[str, ...]]:
+    """Bucket the dictionary by (first letter, length) for CPU picks and hints"""
+    buckets: Dict[Tuple[str, int], List[str]] = {}
+    for w in words:
+        buckets.setdefault((w[0], len(w)), []).append(w)
+    return {k: tuple(v) for k, v in buckets.items()}
+
+DICTIONARY = load_dictionary()
+WORDS_BY_START_LEN = build_word_index(DICTIONARY)
+
 class GameState:
+    __slots__ = (
+        'is_running', 'is_lobby_open', 'players', 'player_ids', 'current_player_index', 'current_word_length',
+        'current_start_letter', 'current_start_letter_upper', 'used_words', 'turn_count',
+        'difficulty', 'player_streaks', 'eliminated_players', 'last_word_length',
+        'difficulty_level', 'turn_start_time', 'timeout_handle', 'timeout_task', 'lock', 'chat_id',
+        'application', 'current_turn_user_id', 'rebound_target_letter', 'rebound_target_length',
+        'group_owner', 'booster_limits', 'player_booster_usage', 'is_practice', 'is_cpu_game',
+        'cpu_difficulty', 'game_mode', 'last_activity_time', 'challenge_index', 'cleanup_handle',
+        '_authority_settings_applied',
+    )
+    # Process-wide word list and its (letter, length) index, shared read-only by every game
+    dictionary: FrozenSet[str] = DICTIONARY
+    words_by_start_len: Dict[Tuple[str, int], Tuple[str, ...]] = WORDS_BY_START_LEN
+
     def __init__(self, chat_id=None, application=None):
         self.is_running = False
         self.is_lobby_open = False
         self.players: List[dict] = []
+        self.player_ids: Set[int] = set()  # Ids of everyone in self.players, for membership checks
         self.current_player_index = 0
         self.current_word_length = 3
         self.current_start_letter = ''
-        self.used_words: Set[str] = set()
+        self.current_start_letter_upper = ''  # Kept in step with current_start_letter for prompts
+        self.used_words: Set[int] = set()  # hash() fingerprints of played words
         self.turn_count = 0
-        self.dictionary: Set[str] = set()
 
-        self.difficulty = 'medium'
+        self.difficulty = DEFAULT_DIFFICULTY
         self.player_streaks: Dict[int, int] = {}
         self.eliminated_players: Set[int] = set()
         self.last_word_length = 3
         self.difficulty_level = 0
 
         self.turn_start_time: Optional[float] = None
-        self.timeout_task: Optional[asyncio.Task] = None
+        self.timeout_handle: Optional[asyncio.TimerHandle] = None  # Pending turn timer
+        self.timeout_task: Optional[asyncio.Task] = None  # Timeout handler, once the timer has fired
+        self.lock = asyncio.Lock()  # Serializes turn changes within this chat
         self.chat_id = chat_id
         self.application = application
         self.current_turn_user_id: Optional[int] = None
@@ -692,43 +1062,23 @@ class GameState:
         self.is_practice: bool = False
         self.is_cpu_game: bool = False
         self.cpu_difficulty: str = 'medium'
-        self.game_mode: str = 'nerd'  # 'chaos' or 'nerd'
-        self.last_activity_time: float = time.time()  # Track for memory cleanup
+        self.game_mode: str = DEFAULT_GAME_MODE
+        self.last_activity_time: float = time.monotonic()  # Track for memory cleanup
         self.challenge_index: int = 0  # Track position in challenge sequence
-
-        self.load_dictionary()
-
-    def load_dictionary(self):
-        if os.path.exists(DICTIONARY_FILE):
-            try:
-                with open(DICTIONARY_FILE, 'r', encoding='utf-8') as f:
-                    self.dictionary = {line.strip().lower() for line in f}
-                logger.info(f"Loaded {len(self.dictionary)} words from {DICTIONARY_FILE}")
-            except Exception as e:
-                logger.error(f"Error loading dictionary: {e}")
-                self.use_fallback_dictionary()
-        else:
-            logger.warning("Dictionary file not found. Using fallback list.")
-            self.use_fallback_dictionary()
-
-    def use_fallback_dictionary(self):
-        self.dictionary = {
-            "cat", "dog", "bat", "rat", "hat", "mat", "sat", "pat",
-            "bird", "word", "nerd", "curd", "herd", "blue", "glue",
-            "apple", "board", "chair", "dance", "eagle", "fruit",
-            "banana", "friend", "orange", "purple", "school",
-            "elephant", "giraffe", "internet", "keyboard"
-        }
+        self._authority_settings_applied: bool = False  # Set by /authority to keep custom booster limits
+        self.cleanup_handle: Optional[asyncio.TimerHandle] = None  # Drops the finished game from `games`
 
     def reset(self):
         self.is_running = False
         self.is_lobby_open = False
         self.players = []
+        self.player_ids = set()
         self.current_player_index = 0
-        self.difficulty = 'medium'
+        self.difficulty = DEFAULT_DIFFICULTY
         difficulty_config = DIFFICULTY_MODES[self.difficulty]
         self.current_word_length = difficulty_config['start_length']
-        self.current_start_letter = random.choice(string.ascii_lowercase) # Random start
+        self.current_start_letter = _LETTERS[_RAND.randrange(26)] # Random start
+        self.current_start_letter_upper = self.current_start_letter.upper()
         self.used_words = set()
         self.turn_count = 0
         self.player_streaks = {}
@@ -739,11 +1089,23 @@ class GameState:
         self.group_owner = None
         self.booster_limits = {'hint': 1, 'skip': 1, 'rebound': 1}
         self.player_booster_usage = {}
-        if hasattr(self, '_authority_settings_applied'):
-            delattr(self, '_authority_settings_applied')
-        if self.timeout_task:
-            self.timeout_task.cancel()
-            self.timeout_task = None
+        self._authority_settings_applied = False
+        self.cancel_timeout()
+        self.last_activity_time = time.monotonic()
+        self.schedule_cleanup()
+
+    def schedule_cleanup(self):
+        """Forget this finished game after GAME_CLEANUP_INTERVAL unless the chat starts another"""
+        if self.cleanup_handle:
+            self.cleanup_handle.cancel()
+            self.cleanup_handle = None
+        if self.chat_id is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.cleanup_handle = loop.call_later(GAME_CLEANUP_INTERVAL, _drop_finished_game, self.chat_id, self)
 
     def set_difficulty(self, difficulty: str):
         if difficulty in DIFFICULTY_MODES:
@@ -757,11 +1119,23 @@ class GameState:
 
     # /authority: Reset the booster limits to 1 per turn (Default)
     # This ensures that if /authority was used in a previous game, it doesn't leak.
+    def add_player(self, user_id: int, name: str, username: str):
+        # 'username' stays raw (it is what the database stores); prompts sent as HTML use 'safe_username'
+        self.players.append({'id': user_id, 'name': name, 'username': username,
+                             'safe_username': html.escape(username, quote=False)})
+        self.player_ids.add(user_id)
+        self.player_streaks.setdefault(user_id, 0)
+
+    def eliminate(self, user_id: int) -> List[dict]:
+        """Knock a player out and return the players still in, in turn order"""
+        self.eliminated_players.add(user_id)
+        return [p for p in self.players if p['id'] not in self.eliminated_players]
+
     def next_turn(self, preserve_challenge=False):
         # Booster usage is now tracked per player across the whole game
         
         # Reset limits to default 1 unless changed by /authority
-        if not hasattr(self, '_authority_settings_applied') or not self._authority_settings_applied:
+        if not self._authority_settings_applied:
             self.booster_limits = {'hint': 1, 'skip': 1, 'rebound': 1}
         
         attempts = 0
@@ -777,14 +1151,15 @@ class GameState:
 
         if not preserve_challenge:
             # Randomize challenges based on mode
-            self.current_start_letter = random.choice(string.ascii_lowercase)
+            self.current_start_letter = _LETTERS[_RAND.randrange(26)]
+            self.current_start_letter_upper = self.current_start_letter.upper()
             
             # Use difficulty config for constraints
             config = DIFFICULTY_MODES.get(self.difficulty, DIFFICULTY_MODES['medium'])
             
             if self.game_mode == 'chaos':
                 # Chaos: random length within difficulty range
-                self.current_word_length = random.randint(config['min_length'], config['max_length'])
+                self.current_word_length = _RAND.randrange(config['min_length'], config['max_length'] + 1)
             else:
                 # Nerd: progressive length
                 num_players = len(self.players) if self.players else 1
@@ -802,7 +1177,7 @@ class GameState:
         
         difficulty_increased = new_time < old_time
 
-        self.turn_start_time = time.time()
+        self.turn_start_time = time.monotonic()
         self.last_word_length = self.current_word_length
         return difficulty_increased
     
@@ -812,9 +1187,24 @@ class GameState:
         return max(20, base_time - time_reduction)
     
     def cancel_timeout(self):
-        if self.timeout_task and not self.timeout_task.done():
-            self.timeout_task.cancel()
-            self.timeout_task = None
+        if self.timeout_handle:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+        task = self.timeout_task
+        # The timeout handler re-arms the next turn itself, so it must not cancel its own task
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        self.timeout_task = None
+
+    def schedule_timeout(self, chat_id: int, user_id: int, application, turn_time: int):
+        """Arm the turn timer with loop.call_later; no coroutine exists until it actually fires"""
+        self.cancel_timeout()
+        self.timeout_handle = asyncio.get_running_loop().call_later(
+            turn_time, self._fire_timeout, chat_id, user_id, application)
+
+    def _fire_timeout(self, chat_id: int, user_id: int, application):
+        self.timeout_handle = None
+        self.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, user_id, application))
 
     def get_streak(self, user_id: int) -> int:
         return self.player_streaks.get(user_id, 0)
@@ -837,171 +1227,415 @@ class GameState:
 
     # Removed can_use_hint, use_hint, can_skip, use_skip, get_hint_words methods
 
-    def initialize_player_stats(self, user_id: int):
-        if user_id not in self.player_streaks:
-            self.player_streaks[user_id] = 0
-    
     def get_cpu_word(self) -> Optional[str]:
         """AI selects a word for CPU turn based on difficulty"""
-        valid_words = [w for w in self.dictionary if len(w) == self.current_word_length and w.startswith(self.current_start_letter) and w not in self.used_words]
-        if not valid_words:
-            return None
+        bucket = self.words_by_start_len.get((self.current_start_letter, self.current_word_length), ())
+        used = self.used_words
         
-        if self.cpu_difficulty == 'easy':
-            # Easy: random word (occasional mistakes)
-            if random.random() < 0.25:
-                return random.choice(valid_words)
-        elif self.cpu_difficulty == 'hard':
-            # Hard: always pick longest word
-            return max(valid_words, key=len)
+        if self.cpu_difficulty == 'hard':
+            # Hard: always pick longest word (every word in the bucket has the target length)
+            return next((w for w in bucket if hash(w) not in used), None)
         
-        # Medium: smart random selection
-        return random.choice(valid_words)
+        # Easy/Medium: random selection, rejection-sampled against used words before filtering the bucket
+        for _ in range(8):
+            if not bucket:
+                return None
+            w = bucket[_RAND.randrange(len(bucket))]
+            if hash(w) not in used:
+                return w
+        # Mostly-used bucket: one reservoir-sampling pass picks uniformly without building a list
+        chosen, seen = None, 0
+        for w in bucket:
+            if hash(w) not in used:
+                seen += 1
+                if _RAND.randrange(seen) == 0:
+                    chosen = w
+        return chosen
 
 # Key: chat_id, Value: GameState
 games: Dict[int, GameState] = {}
 db = DatabaseManager(DB_FILE)
+_KNOWN_USERS: Set[int] = db.get_all_user_ids()  # user_ids already in leaderboard
+
+def ensure_player(user_id: int, username: str):
+    """Create the leaderboard row once; returning users skip the DB round-trip"""
+    ensure_players([(user_id, username)])
+
+def ensure_players(rows: Sequence[Tuple[int, str]]):
+    """Create leaderboard rows for any new (user_id, username) pairs with a single batched write"""
+    new_rows = [row for row in rows if row[0] not in _KNOWN_USERS]
+    if new_rows:
+        db.ensure_players_exist(new_rows)
+        _KNOWN_USERS.update(user_id for user_id, _ in new_rows)
+
+def _normalize_name(user) -> Tuple[str, str]:
+    """Return (display_name, username_to_store) for a Telegram user"""
+    return _display_and_username(user.id, user.first_name, user.username)
+
+@lru_cache(maxsize=8192)
+def _display_and_username(user_id: int, first_name: Optional[str], username: Optional[str]) -> Tuple[str, str]:
+    # Cached per (id, first_name, username) so repeat joins reuse the same string objects
+    display_name = (first_name or username or "Player").strip()
+    if not display_name or display_name == "None":
+        display_name = "Player"
+    return display_name, (username if username else display_name).lstrip('@')
 
 # ==========================================
 # STALE MESSAGE FILTERING & RATE LIMITING & CLEANUP
 # ==========================================
 BOT_START_TIME = time.time()  # Track when bot starts to filter old messages
 STALE_MESSAGE_THRESHOLD = 5  # Ignore messages older than 5 seconds from now
-user_command_cooldowns: Dict[int, Dict[str, float]] = {}  # {user_id: {command: last_time}}
 COMMAND_COOLDOWN_SECONDS = 1  # 1 second between commands per user
-GAME_CLEANUP_INTERVAL = 3600  # Clean up games every hour
+# Two cooldown-wide buckets of {(user_id, command): monotonic time of last accepted use}. Once the current
+# bucket is a window old it becomes the previous one and the old previous is dropped wholesale, so state
+# only covers users active in the last two windows.
+_rate_state: Dict[Tuple[int, str], float] = {}
+_rate_prev: Dict[Tuple[int, str], float] = {}
+_rate_bucket_start = 0.0
+GAME_CLEANUP_INTERVAL = 3600  # Forget a finished game after an hour without a new one
 
 def is_message_stale(update: Update) -> bool:
     """Check if a message was sent before bot started (prevents processing offline messages)"""
-    if not update.message or not update.message.date:
+    msg = update.message
+    if msg is None:
         return False
-    
-    message_timestamp = update.message.date.timestamp()
-    current_time = time.time()
-    
+    sent = msg.date
     # Ignore messages older than the threshold
-    if current_time - message_timestamp > STALE_MESSAGE_THRESHOLD:
-        return True
-    
-    return False
+    return sent is not None and time.time() - sent.timestamp() > STALE_MESSAGE_THRESHOLD
 
-async def cleanup_old_games():
-    """Periodically remove completed games from memory to prevent memory leaks"""
-    while True:
-        try:
-            await asyncio.sleep(GAME_CLEANUP_INTERVAL)
-            current_time = time.time()
-            games_to_delete = []
-            
-            for chat_id, game in games.items():
-                # Remove games that are not running and haven't been touched for 1 hour
-                if not game.is_running and not game.is_lobby_open:
-                    if hasattr(game, 'last_activity_time'):
-                        if current_time - game.last_activity_time > GAME_CLEANUP_INTERVAL:
-                            games_to_delete.append(chat_id)
-                    else:
-                        games_to_delete.append(chat_id)
-            
-            for chat_id in games_to_delete:
-                del games[chat_id]
-                logger.info(f"Cleaned up game state for chat {chat_id}")
-        except Exception as e:
-            logger.error(f"Error in game cleanup task: {e}")
+_TODAY_CACHE: Tuple[int, str] = (-1, '')  # (UTC day number, its YYYY-MM-DD string)
+
+def _today_str() -> str:
+    """Today's UTC date as YYYY-MM-DD, formatted once per day"""
+    global _TODAY_CACHE
+    day = int(time.time() // 86400)
+    if _TODAY_CACHE[0] != day:
+        _TODAY_CACHE = (day, time.strftime("%Y-%m-%d", time.gmtime(day * 86400)))
+    return _TODAY_CACHE[1]
+
+def _drop_finished_game(chat_id: int, game: GameState):
+    """Remove a game left idle since its reset() (scheduled by GameState.schedule_cleanup)"""
+    game.cleanup_handle = None
+    if games.get(chat_id) is game and not game.is_running and not game.is_lobby_open:
+        del games[chat_id]
+        logger.info(f"Cleaned up game state for chat {chat_id}")
 
 def check_rate_limit(user_id: int, command: str) -> bool:
     """Check if user has exceeded command rate limit"""
-    current_time = time.time()
-    
-    if user_id not in user_command_cooldowns:
-        user_command_cooldowns[user_id] = {}
-    
-    if command in user_command_cooldowns[user_id]:
-        last_use = user_command_cooldowns[user_id][command]
-        if current_time - last_use < COMMAND_COOLDOWN_SECONDS:
-            return False
+    global _rate_state, _rate_prev, _rate_bucket_start
+    key = (user_id, command)
+    now = time.monotonic()
+    if now - _rate_bucket_start >= COMMAND_COOLDOWN_SECONDS:
+        # Anything older than the previous bucket is past its cooldown anyway
+        _rate_prev = _rate_state if now - _rate_bucket_start < 2 * COMMAND_COOLDOWN_SECONDS else {}
+        _rate_state = {}
+        _rate_bucket_start = now
+    last = _rate_state.get(key) or _rate_prev.get(key)
+    if last is not None and now - last < COMMAND_COOLDOWN_SECONDS:
+        return False
     
-    user_command_cooldowns[user_id][command] = current_time
+    _rate_state[key] = now
     return True
 
+ADMIN_STATUSES = frozenset({'administrator', 'creator'})  # ChatMember statuses with admin rights
+ADMIN_CACHE_TTL = 300  # Seconds a chat-admin lookup is reused before asking Telegram again
+ADMIN_CACHE_MAX = 4096  # Cached lookups kept before the cache is flushed
+_admin_cache: Dict[Tuple[int, int], Tuple[bool, float]] = {}  # {(chat_id, user_id): (is_admin, monotonic expiry)}
+
+async def is_chat_admin(bot, chat_id: int, user_id: int) -> bool:
+    """Whether the user is a creator/administrator of the chat, cached for ADMIN_CACHE_TTL"""
+    key = (chat_id, user_id)
+    now = time.monotonic()
+    cached = _admin_cache.get(key)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    try:
+        member = await bot.get_chat_member(chat_id, user_id)
+    except TelegramError as e:
+        logger.error(f"Error checking admin status: {e}")
+        return False
+    is_admin = member.status in ADMIN_STATUSES
+    if len(_admin_cache) >= ADMIN_CACHE_MAX:
+        _admin_cache.clear()
+    _admin_cache[key] = (is_admin, now + ADMIN_CACHE_TTL)
+    return is_admin
+
+PROFILE_PHOTO_TTL = 3600  # Seconds a user's profile photo file_id (or lack of one) is reused
+PROFILE_PHOTO_TIMEOUT = 2.0  # Give up on a slow photo lookup and send text only
+PROFILE_PHOTO_CACHE_MAX = 4096  # Cached photo lookups kept before the cache is flushed
+_profile_photo_cache: Dict[int, Tuple[Optional[str], float]] = {}  # {user_id: (file_id or None, monotonic expiry)}
+
+async def get_profile_photo_id(bot, user_id: int) -> Optional[str]:
+    """file_id of the user's largest current profile photo, cached for PROFILE_PHOTO_TTL"""
+    now = time.monotonic()
+    cached = _profile_photo_cache.get(user_id)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    try:
+        photos = await asyncio.wait_for(bot.get_user_profile_photos(user_id, limit=1), PROFILE_PHOTO_TIMEOUT)
+    except (TelegramError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching profile photo: {e}")
+        return None
+    file_id = photos.photos[0][-1].file_id if photos.photos else None
+    if len(_profile_photo_cache) >= PROFILE_PHOTO_CACHE_MAX:
+        _profile_photo_cache.clear()
+    _profile_photo_cache[user_id] = (file_id, now + PROFILE_PHOTO_TTL)
+    return file_id
+
+async def _send_timeout_parts(bot, chat_id: int, parts: List[str]):
+    """Send the timeout notice and its follow-ups as one message, or one each if COMBINE_TIMEOUT_MESSAGES is off"""
+    texts = ["\n\n".join(parts)] if COMBINE_TIMEOUT_MESSAGES else parts
+    for text in texts:
+        await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+
 async def handle_turn_timeout(chat_id: int, user_id: int, application):
-    """Handle turn timeout - eliminate player"""
+    """Handle turn timeout - eliminate player (started by the timer from GameState.schedule_timeout)"""
     try:
-        # Get turn time from game state or default
-        if chat_id not in games: return
-        turn_time = games[chat_id].get_turn_time()
-            
-        await asyncio.sleep(turn_time)
-        
         if chat_id not in games: return
         game = games[chat_id]
         
-        # Check if it's still this user's turn
-        current_player = game.players[game.current_player_index]
-        if not game.is_running or current_player['id'] != user_id:
-            return
-
-        # Player timed out
-        game.eliminated_players.add(user_id)
-        game.reset_streak(user_id, is_timeout=True)
-        
-        if not game.is_practice:
-            db.update_word_stats(user_id, current_player['name'], "", 0, forfeit=True)
-        
-        if game.is_practice:
-            await application.bot.send_message(
-                chat_id=chat_id,
-                text=f"⏰ <b>TIME'S UP!</b>\n\n❌ You were eliminated due to timeout!\n\n(Practice mode - no points deducted)",
-                parse_mode='HTML'
-            )
-        else:
-            await application.bot.send_message(
-                chat_id=chat_id,
-                text=f"⏰ <b>TIME'S UP!</b>\n\n❌ @{current_player['username']} is eliminated due to timeout!\n\n<i>Forfeit - points earned before timeout still count.</i>",
-                parse_mode='HTML'
-            )
+        async with game.lock:
+            # Check if it's still this user's turn (a move may have landed while we waited on the lock)
+            if not game.is_running:
+                return
+            current_player = game.players[game.current_player_index]
+            if current_player['id'] != user_id:
+                return
+
+            # Player timed out
+            alive_players = game.eliminate(user_id)
+            game.reset_streak(user_id, is_timeout=True)
         
-        game.next_turn()
+            if not game.is_practice:
+                await asyncio.to_thread(db.update_word_stats, user_id, current_player['name'], "", 0, forfeit=True)
         
-        # Check for winner
-        if len(game.eliminated_players) >= len(game.players) - 1:
-            winner = next((p for p in game.players if p['id'] not in game.eliminated_players), None)
-            if winner:
-                await application.bot.send_message(
-                    chat_id=chat_id,
-                    text=f"🏆 <b>GAME OVER!</b>\n\n👑 <b>Winner:</b> @{winner['username']}",
-                    parse_mode='HTML'
-                )
-                for player in game.players:
-                    db.increment_games_played(player['id'])
-            game.reset()
-            return
+            # Timeout notice first; the game-over or next-turn text is appended below
+            parts = [TIMEOUT_PRACTICE_MSG if game.is_practice else TIMEOUT_REAL_MSG % current_player['safe_username']]
         
-        # Find next valid player
-        next_player = game.players[game.current_player_index]
+            # Check for winner
+            if len(alive_players) <= 1:
+                winner = alive_players[0] if alive_players else None
+                if winner:
+                    parts.append(GAME_OVER_MSG % winner['safe_username'])
+                await _send_timeout_parts(application.bot, chat_id, parts)
+                if winner:
+                    await asyncio.to_thread(db.increment_games_played_bulk, [p['id'] for p in game.players])
+                game.reset()
+                return
         
-        if next_player['id'] in game.eliminated_players:
-            for player in game.players:
-                db.increment_games_played(player['id'])
-            game.reset()
-            await application.bot.send_message(chat_id, "❌ No valid players remaining. Game reset.")
-            return
+            # At least two players remain, so next_turn() lands on one of them
+            game.next_turn()
+            next_player = game.players[game.current_player_index]
         
-        turn_time = game.get_turn_time()
-        game.current_turn_user_id = next_player['id']
+            turn_time = game.get_turn_time()
+            game.current_turn_user_id = next_player['id']
         
-        await application.bot.send_message(
-            chat_id=chat_id,
-            text=f"👉 @{next_player['username']}'s Turn\n"
-                 f"Target: <b>{game.current_word_length} letters</b> starting with <b>{game.current_start_letter.upper()}</b>\n"
-                 f"⏱️ <b>Time: {turn_time}s</b>",
-            parse_mode='HTML'
-        )
-        game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], application))
-            
+            parts.append(TURN_PROMPT % (next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time))
+            await _send_timeout_parts(application.bot, chat_id, parts)
+            game.schedule_timeout(chat_id, next_player['id'], application, turn_time)
+
     except asyncio.CancelledError:
         pass
+    except TelegramError as e:
+        logger.warning(f"Timeout handler could not send to chat {chat_id}: {e}")
+    except sqlite3.Error as e:
+        logger.error(f"Database error in timeout handler: {e}")
     except Exception as e:
-        logger.error(f"Error in timeout handler: {e}")
+        # The fired timer is gone and no new one was scheduled; end the game rather than leave the chat stuck
+        logger.error(f"Unexpected error in timeout handler for chat {chat_id}: {e}", exc_info=True)
+        game = games.get(chat_id)
+        if game is not None:
+            async with game.lock:
+                game.reset()
+
+# ==========================================
+# OUTBOUND MESSAGE QUEUE
+# ==========================================
+OUTBOX_GLOBAL_RATE = 30  # Telegram bot-wide limit (messages per second)
+OUTBOX_CHAT_INTERVAL = 1.0  # Seconds between queued sends in one chat
+OUTBOX_IDLE_TIMEOUT = 30  # Chat workers exit after this long without messages
+_OUTBOX: Dict[int, asyncio.Queue] = {}  # {chat_id: queue of (text, kwargs)}
+_OUTBOX_WORKERS: Set[asyncio.Task] = set()  # Strong refs so running workers aren't garbage-collected
+_outbox_next_slot = 0.0  # Earliest monotonic time the next global send may start
+
+async def _outbox_wait_global_slot():
+    """Space sends across all chats to stay under OUTBOX_GLOBAL_RATE"""
+    global _outbox_next_slot
+    now = time.monotonic()
+    slot = max(now, _outbox_next_slot)
+    _outbox_next_slot = slot + 1 / OUTBOX_GLOBAL_RATE
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+async def _outbox_worker(bot, chat_id: int, queue: asyncio.Queue):
+    """Drain one chat's queue in FIFO order, then exit once idle"""
+    try:
+        while True:
+            try:
+                text, kwargs = await asyncio.wait_for(queue.get(), OUTBOX_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            while True:
+                await _outbox_wait_global_slot()
+                try:
+                    await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                except RetryAfter as e:
+                    # Flood control: wait as long as Telegram asks, then resend the same message
+                    delay = e.retry_after
+                    await asyncio.sleep(delay.total_seconds() if isinstance(delay, timedelta) else delay)
+                    continue
+                except Exception as e:
+                    logger.error(f"Outbox send to {chat_id} failed: {e}")
+                break
+            await asyncio.sleep(OUTBOX_CHAT_INTERVAL)
+    finally:
+        # Queue is only filled synchronously, so nothing can slip in between timeout and removal
+        if _OUTBOX.get(chat_id) is queue:
+            del _OUTBOX[chat_id]
+
+async def send(bot, chat_id: int, text: str, reply_to: Optional[Message] = None, **kwargs):
+    """Queue a message for chat_id; returns immediately while the chat worker sends it
+
+    With reply_to, the message is sent like reply_text would: quoting it and in the same forum topic.
+    """
+    if reply_to is not None:
+        if reply_to.is_topic_message:
+            kwargs.setdefault('message_thread_id', reply_to.message_thread_id)
+        # The send may happen a while later, so don't fail if the command message was deleted meanwhile
+        kwargs.setdefault('reply_parameters', ReplyParameters(reply_to.message_id, allow_sending_without_reply=True))
+    queue = _OUTBOX.get(chat_id)
+    if queue is None:
+        queue = _OUTBOX[chat_id] = asyncio.Queue()
+        task = asyncio.create_task(_outbox_worker(bot, chat_id, queue))
+        _OUTBOX_WORKERS.add(task)
+        task.add_done_callback(_OUTBOX_WORKERS.discard)
+    queue.put_nowait((text, kwargs))
+
+# ==========================================
+# BACKGROUND STATS WRITER
+# ==========================================
+STATS_FLUSH_INTERVAL = 0.1  # Seconds to let a burst of turns accumulate before writing
+STATS_BATCH_MAX = 100  # Max queued turns written per transaction
+STATS_WRITE_ATTEMPTS = 5  # Tries per batch before it is logged as lost (e.g. database stays locked)
+STATS_RETRY_DELAY = 0.5  # Seconds before the first retry; doubles on each further try
+_STATS_QUEUE: Optional[asyncio.Queue] = None  # (chat_id, user_id, username, word, streak)
+_STATS_WRITER: Optional[asyncio.Task] = None
+
+def queue_word_stats(chat_id: int, user_id: int, username: str, word: str, streak: int):
+    """Hand a turn's stats write to the background writer started in post_init"""
+    _STATS_QUEUE.put_nowait((chat_id, user_id, username, word, streak))
+
+async def start_stats_writer(application):
+    """post_init hook: create the stats queue and start its writer (again after a polling restart)"""
+    global _STATS_QUEUE, _STATS_WRITER
+    if _STATS_QUEUE is None:
+        _STATS_QUEUE = asyncio.Queue()
+    if _STATS_WRITER is None or _STATS_WRITER.done():
+        _STATS_WRITER = asyncio.create_task(_stats_writer(application, _STATS_QUEUE))
+
+async def stop_stats_writer(application):
+    """post_shutdown hook: have the writer flush every turn still queued, then wait for it to exit"""
+    global _STATS_WRITER
+    if _STATS_WRITER is not None:
+        _STATS_QUEUE.put_nowait(None)
+        await _STATS_WRITER
+        _STATS_WRITER = None
+
+def _title_unlock_text(newly_unlocked) -> str:
+    unlock_msg = "🏆 <b>NEW TITLES UNLOCKED!</b>\n\n"
+    for title_key, stage in newly_unlocked:
+        title_info = TITLES[title_key]
+        stage_info = STAGES[stage]
+        multiplier = stage_info['multiplier']
+        unlock_msg += (
+            f"{stage_info['color']} <b>{title_info['display']} {stage_info['display']}</b>\n"
+            f"<i>Requirement met! Multiplier: {multiplier}x</i>\n\n"
+        )
+    return unlock_msg
+
+async def _write_stats_batch(batch):
+    """Write one batch, retrying on database errors; returns {user_id: newly unlocked} or None if it was lost"""
+    entries = [item[1:] for item in batch]
+    delay = STATS_RETRY_DELAY
+    for attempt in range(1, STATS_WRITE_ATTEMPTS + 1):
+        try:
+            return await asyncio.to_thread(db.update_word_stats_batch, entries)
+        except sqlite3.Error as e:
+            if attempt == STATS_WRITE_ATTEMPTS:
+                logger.error(f"Database error: {e}; dropped {len(entries)} queued word stats: {entries}")
+                return None
+            logger.warning(f"Database error: {e}; retrying word stats batch in {delay}s")
+            await asyncio.sleep(delay)
+            delay *= 2
+
+async def _stats_writer(application, queue: asyncio.Queue):
+    """Drain queued turn writes in batches, one transaction per batch, off the event loop thread
+
+    A None item (queued by stop_stats_writer) writes what is left and exits.
+    """
+    stopping = False
+    while not (stopping and queue.empty()):
+        batch = [await queue.get()]
+        if batch[0] is not None and not stopping:
+            await asyncio.sleep(STATS_FLUSH_INTERVAL)
+        while not queue.empty() and len(batch) < STATS_BATCH_MAX:
+            batch.append(queue.get_nowait())
+        if None in batch:
+            stopping = True
+            batch.remove(None)
+        if not batch:
+            continue
+        unlocked = await _write_stats_batch(batch)
+        # After shutdown the bot can't send; the unlocked titles are stored all the same
+        if not unlocked or stopping:
+            continue
+        for chat_id, user_id, *_ in batch:
+            newly_unlocked = unlocked.pop(user_id, None)
+            if newly_unlocked:
+                try:
+                    await application.bot.send_message(chat_id=chat_id, text=_title_unlock_text(newly_unlocked), parse_mode='HTML')
+                except TelegramError as e:
+                    logger.warning(f"Failed to announce title unlock to {user_id} in {chat_id}: {e}")
+
+# ==========================================
+# MEMBER TRACKING (.tagall)
+# ==========================================
+MEMBER_FLUSH_INTERVAL = 5  # Seconds of member sightings coalesced into one chat_members write
+MEMBER_BATCH_MAX = 500  # Max rows written per transaction
+MEMBER_SEEN_MAX = 100_000  # Remembered (chat_id, user_id) sightings before the oldest are evicted
+_PENDING_MEMBERS: Dict[Tuple[int, int], str] = {}  # {(chat_id, user_id): latest username} awaiting a flush
+_SEEN_MEMBERS: Dict[Tuple[int, int], str] = {}  # {(chat_id, user_id): username last queued}, oldest first
+_member_flusher_running = False
+
+def track_member(chat_id: int, user_id: int, username: str):
+    """Queue a member sighting for the background flusher (started on first use); unchanged repeats are skipped"""
+    global _member_flusher_running
+    key = (chat_id, user_id)
+    if _SEEN_MEMBERS.get(key) == username:
+        return
+    if key not in _SEEN_MEMBERS and len(_SEEN_MEMBERS) >= MEMBER_SEEN_MAX:
+        del _SEEN_MEMBERS[next(iter(_SEEN_MEMBERS))]
+    _SEEN_MEMBERS[key] = username
+    _PENDING_MEMBERS[key] = username
+    if not _member_flusher_running:
+        _member_flusher_running = True
+        asyncio.create_task(_member_flusher())
+
+async def _member_flusher():
+    """Write pending member sightings in batches, then exit once nothing new arrives"""
+    global _member_flusher_running
+    try:
+        while _PENDING_MEMBERS:
+            await asyncio.sleep(MEMBER_FLUSH_INTERVAL)
+            rows = [(chat_id, user_id, username) for (chat_id, user_id), username in _PENDING_MEMBERS.items()]
+            _PENDING_MEMBERS.clear()
+            for i in range(0, len(rows), MEMBER_BATCH_MAX):
+                try:
+                    await asyncio.to_thread(db.upsert_chat_members, rows[i:i + MEMBER_BATCH_MAX])
+                except sqlite3.Error as e:
+                    logger.error(f"Member tracking write failed: {e}")
+    finally:
+        _member_flusher_running = False
 
 # ==========================================
 # BOT COMMANDS
@@ -1014,38 +1648,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     # Give KAMI title only to configured owner
-    if BOT_OWNER_ID > 0 and user.id == BOT_OWNER_ID:
+    if BOT_OWNER_ID > 0 and user.id in _KAMI_IDS:
         db.unlock_title(user.id, 'kami')
     
-    await update.message.reply_text(
-        "🎮 <b>Welcome to the KURIMUZON Word Game!</b>\n\n"
-        "📋 <b>Game Commands:</b>\n"
-        "/lobby - Open a new game lobby\n"
-        "/join - Join the lobby\n"
-        "/begin - Start the game (needs 2+ players)\n"
-        "/difficulty [easy/medium/hard] - Set difficulty\n"
-        "/forfeit - Give up your turn (-10 pts, points before forfeit count)\n"
-        "/stop - Stop the current game\n\n"
-        "💰 <b>Shop & Boosts:</b>\n"
-        "/shop - View available boosts\n"
-        "/buy_hint /buy_skip /buy_rebound - Purchase boosts\n"
-        "/hint - Get word suggestions\n"
-        "/skip_boost - Skip without penalty\n"
-        "/rebound - Skip & pass question to next player\n\n"
-        "📊 <b>Stats & Leaderboard:</b>\n"
-        "/mystats - View your personal stats\n"
-        "/leaderboard [score/words/streak/longest] - Top players\n\n"
-        "🏆 <b>Achievements & Titles:</b>\n"
-        "/achievements - View all available titles\n"
-        "/settitle [title] - Set your active title\n"
-        "/mytitle - View your current title\n\n"
-        "💡 <b>Features:</b>\n"
-        "• Streak tracking & combo bonuses\n"
-        "• Three difficulty modes\n"
-        "• Comprehensive player statistics\n"
-        "• Stylized achievement titles\n",
-        parse_mode='HTML'
-    )
+    await update.message.reply_text(START_TEXT, parse_mode='HTML')
 
 async def lobby(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if is_message_stale(update):
@@ -1069,12 +1675,8 @@ async def lobby(update: Update, context: ContextTypes.DEFAULT_TYPE):
     game.group_owner = update.effective_user.id
 
     user = update.effective_user
-    display_name = str(user.first_name or user.username or "Player").strip()
-    if not display_name or display_name == "None":
-        display_name = "Player"
-    username_to_store = (user.username if user.username else display_name).lstrip('@')
-    game.players.append({'id': user.id, 'name': display_name, 'username': username_to_store})
-    db.ensure_player_exists(user.id, username_to_store)
+    display_name, username_to_store = _normalize_name(user)
+    game.add_player(user.id, display_name, username_to_store)
 
     await update.message.reply_text(
         f"📢 <b>Lobby Opened!</b>\n\n"
@@ -1096,17 +1698,12 @@ async def join(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     game = games[chat_id]
 
-    if any(p['id'] == user.id for p in game.players):
+    if user.id in game.player_ids:
         await update.message.reply_text(f"👤 You are already in.")
         return
 
-    display_name = str(user.first_name or user.username or "Player").strip()
-    if not display_name or display_name == "None":
-        display_name = "Player"
-    username_to_store = (user.username if user.username else display_name).lstrip('@')
-    game.players.append({'id': user.id, 'name': display_name, 'username': username_to_store})
-    game.initialize_player_stats(user.id)
-    db.ensure_player_exists(user.id, username_to_store)
+    display_name, username_to_store = _normalize_name(user)
+    game.add_player(user.id, display_name, username_to_store)
     await update.message.reply_text(f"✅ {display_name} joined! (Total: {len(game.players)})", parse_mode='HTML')
 
 async def begin_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1126,8 +1723,8 @@ async def begin_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("⚠️ You need at least 2 players!")
         return
 
-    for player in game.players:
-        game.initialize_player_stats(player['id'])
+    # Leaderboard rows for the whole lobby in one write (lobby/join no longer insert one by one)
+    ensure_players([(p['id'], p['username']) for p in game.players])
 
     game.is_lobby_open = False
     game.is_running = True
@@ -1137,31 +1734,31 @@ async def begin_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     game.used_words = set()
     
     # Randomize first challenge
-    game.current_start_letter = random.choice(string.ascii_lowercase)
+    game.current_start_letter = _LETTERS[_RAND.randrange(26)]
+    game.current_start_letter_upper = game.current_start_letter.upper()
     if game.game_mode == 'chaos':
-        game.current_word_length = random.randint(3, 12)
+        game.current_word_length = _RAND.randrange(3, 13)
     else:
         game.current_word_length = 3
 
-    game.turn_start_time = time.time()
+    game.turn_start_time = time.monotonic()
     current_player = game.players[game.current_player_index]
     turn_time = game.get_turn_time()
     game.current_turn_user_id = current_player['id']
 
-    difficulty_emoji = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
-    player_names = ', '.join([str(p['name']) for p in game.players if p.get('name')])
+    player_names = ', '.join(p['name'] for p in game.players)  # names are non-empty str (_normalize_name)
     await update.message.reply_text(
         f"🎮 <b>Game Started!</b>\n"
         f"Mode: <b>{game.game_mode.upper()}</b>\n"
-        f"Difficulty: {difficulty_emoji.get(game.difficulty, '🟡')} <b>{game.difficulty.upper()}</b>\n"
+        f"Difficulty: {DIFFICULTY_EMOJI.get(game.difficulty, '🟡')} <b>{game.difficulty.upper()}</b>\n"
         f"Players: {player_names}\n\n"
-        f"👉 {str(current_player['name'])}'s turn!\n"
-        f"Write a word with exactly <b>{game.current_word_length}</b> letters starting with <b>'{game.current_start_letter.upper()}'</b>\n"
+        f"👉 {current_player['name']}'s turn!\n"
+        f"Write a word with exactly <b>{game.current_word_length}</b> letters starting with <b>'{game.current_start_letter_upper}'</b>\n"
         f"⏱️ <b>Time: {turn_time}s</b>",
         parse_mode='HTML'
     )
     
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, current_player['id'], context.application))
+    game.schedule_timeout(chat_id, current_player['id'], context.application, turn_time)
 
 async def stop_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
@@ -1173,17 +1770,8 @@ async def stop_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     game = games[chat_id]
     
-    # Check if user is the lobby creator or an admin
-    is_lobby_creator = user.id == game.group_owner
-    is_admin = False
-    
-    try:
-        member = await context.bot.get_chat_member(chat_id, user.id)
-        is_admin = member.status in ['administrator', 'creator']
-    except Exception as e:
-        logger.error(f"Error checking admin status: {e}")
-    
-    if not is_lobby_creator and not is_admin:
+    # Check if user is the lobby creator or bot owner (both known locally) or an admin
+    if user.id != game.group_owner and user.id != BOT_OWNER_ID and not await is_chat_admin(context.bot, chat_id, user.id):
         await update.message.reply_text("❌ Only the lobby creator or admins can stop the game!")
         return
     
@@ -1191,57 +1779,21 @@ async def stop_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("🛑 Game stopped by admin or lobby creator.")
 
 async def leaderboard(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    category_map = {
-        'score': 'total_score',
-        'words': 'total_words',
-        'streak': 'best_streak',
-        'longest': 'longest_word_length'
-    }
-
     category_input = context.args[0].lower() if context.args else 'score'
-    category = category_map.get(category_input, 'total_score')
+    category = LEADERBOARD_CATEGORIES.get(category_input, 'total_score')
     user_id = update.effective_user.id
 
-    # Fetch all players to find the user's rank
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute(f"SELECT user_id, username, {category} FROM leaderboard ORDER BY {category} DESC")
-    all_players = c.fetchall()
-    conn.close()
+    # Page of 10 holding the user's rank (or the top 10 if they have no row)
+    user_rank, start_idx, total_players, page_players = await asyncio.to_thread(db.get_leaderboard_page, category, user_id)
 
-    if not all_players:
+    if not total_players:
         await update.message.reply_text("🏆 Leaderboard is empty!")
         return
 
-    # Find user's rank
-    user_rank = -1
-    for idx, (p_id, p_name, p_val) in enumerate(all_players, 1):
-        if p_id == user_id:
-            user_rank = idx
-            break
-    
-    # Calculate page range (10 per page)
-    if user_rank == -1:
-        start_idx = 0
-        end_idx = 10
-    else:
-        # Determine which page of 10 the user is on
-        page = (user_rank - 1) // 10
-        start_idx = page * 10
-        end_idx = start_idx + 10
-
-    # Get the slice for the page
-    page_players = all_players[start_idx:end_idx]
-
-    category_names = {
-        'total_score': 'Total Score',
-        'total_words': 'Words Played',
-        'best_streak': 'Best Streak',
-        'longest_word_length': 'Longest Word'
-    }
-
-    text = f"🏆 <b>Leaderboard - {category_names.get(category, 'Total Score')}</b> 🏆\n"
-    text += f"<i>Showing ranks {start_idx + 1} - {min(end_idx, len(all_players))}</i>\n\n"
+    parts = [
+        f"🏆 <b>Leaderboard - {LEADERBOARD_CATEGORY_NAMES.get(category, 'Total Score')}</b> 🏆\n",
+        f"<i>Showing ranks {start_idx + 1} - {start_idx + len(page_players)}</i>\n\n",
+    ]
     
     for idx, (p_id, p_name, p_val) in enumerate(page_players, start_idx + 1):
         # Emojis for top 3
@@ -1252,15 +1804,15 @@ async def leaderboard(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Highlight current user
         if p_id == user_id:
-            text += f"👉 <b>{emoji} {p_name} - {p_val}</b> (YOU)\n"
+            parts.append(f"👉 <b>{emoji} {p_name} - {p_val}</b> (YOU)\n")
         else:
-            text += f"{emoji} <b>{p_name}</b> - {p_val}\n"
+            parts.append(f"{emoji} <b>{p_name}</b> - {p_val}\n")
 
-    if user_rank != -1:
-        text += f"\n👤 Your Rank: <b>#{user_rank}</b>"
+    if user_rank:
+        parts.append(f"\n👤 Your Rank: <b>#{user_rank}</b>")
     
-    text += "\n\n💡 Use: /leaderboard [score/words/streak/longest]"
-    await update.message.reply_text(text, parse_mode='HTML')
+    parts.append("\n\n💡 Use: /leaderboard [score/words/streak/longest]")
+    await send(context.bot, update.effective_chat.id, ''.join(parts), reply_to=update.message, parse_mode='HTML')
 
 async def mode_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Switch between Chaos and Nerd game modes"""
@@ -1268,37 +1820,28 @@ async def mode_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     chat_id = update.effective_chat.id
-    if chat_id not in games:
-        games[chat_id] = GameState(chat_id=chat_id, application=context.application)
-    
-    game = games[chat_id]
+    # Info requests and invalid modes don't need a GameState; only allocate one to store a change
+    game = games.get(chat_id)
     
-    if game.is_running:
+    if game is not None and game.is_running:
         await update.message.reply_text("❌ Cannot change mode during an active game!")
         return
     
     if not context.args:
+        current_mode = game.game_mode if game is not None else DEFAULT_GAME_MODE
         await update.message.reply_text(
-            f"🎮 <b>Current Mode: {game.game_mode.upper()}</b>\n\n"
-            "🎲 <b>CHAOS</b>\n"
-            "• Random letters each turn\n"
-            "• Random word lengths (3-12 letters)\n"
-            "• Unpredictable & chaotic\n\n"
-            "🤓 <b>NERD</b>\n"
-            "• Random letters each turn\n"
-            "• Word length increases +1 every round\n"
-            "• Starts at 3 letters\n\n"
-            "Use: /mode [chaos/nerd]",
+            f"🎮 <b>Current Mode: {current_mode.upper()}</b>\n\n" + MODE_HELP_TEXT,
             parse_mode='HTML'
         )
         return
     
     new_mode = context.args[0].lower()
-    if new_mode in ['chaos', 'nerd']:
+    if new_mode in MODE_EMOJI:
+        if game is None:
+            game = games[chat_id] = GameState(chat_id=chat_id, application=context.application)
         game.game_mode = new_mode
-        mode_emoji = {'chaos': '🎲', 'nerd': '🤓'}
         await update.message.reply_text(
-            f"✅ Mode set to {mode_emoji[new_mode]} <b>{new_mode.upper()}</b>!",
+            f"✅ Mode set to {MODE_EMOJI[new_mode]} <b>{new_mode.upper()}</b>!",
             parse_mode='HTML'
         )
     else:
@@ -1306,31 +1849,28 @@ async def mode_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def difficulty(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
-    if chat_id not in games:
-        games[chat_id] = GameState(chat_id=chat_id, application=context.application)
-
-    game = games[chat_id]
+    # Info requests and invalid difficulties don't need a GameState; only allocate one to store a change
+    game = games.get(chat_id)
 
-    if game.is_running:
+    if game is not None and game.is_running:
         await update.message.reply_text("❌ Cannot change difficulty during an active game!")
         return
 
     if not context.args:
+        current_difficulty = game.difficulty if game is not None else DEFAULT_DIFFICULTY
         await update.message.reply_text(
-            f"🎯 Current difficulty: <b>{game.difficulty.upper()}</b>\n\n"
-            "🟢 <b>Easy</b>: 3-10 letters, slower progression\n"
-            "🟡 <b>Medium</b>: 3-15 letters, moderate progression\n"
-            "🔴 <b>Hard</b>: 4-20 letters, fast progression\n\n"
-            "Use: /difficulty [easy/medium/hard]",
+            f"🎯 Current difficulty: <b>{current_difficulty.upper()}</b>\n\n" + DIFFICULTY_HELP_TEXT,
             parse_mode='HTML'
         )
         return
 
     new_diff = context.args[0].lower()
-    if game.set_difficulty(new_diff):
-        difficulty_emoji = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
+    if new_diff in DIFFICULTY_MODES:
+        if game is None:
+            game = games[chat_id] = GameState(chat_id=chat_id, application=context.application)
+        game.set_difficulty(new_diff)
         await update.message.reply_text(
-            f"✅ Difficulty set to {difficulty_emoji[new_diff]} <b>{new_diff.upper()}</b>!",
+            f"✅ Difficulty set to {DIFFICULTY_EMOJI[new_diff]} <b>{new_diff.upper()}</b>!",
             parse_mode='HTML'
         )
     else:
@@ -1343,44 +1883,39 @@ async def forfeit_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     game = games[chat_id]
-    user = update.effective_user
-    current_player = game.players[game.current_player_index]
-    
-    if user.id != current_player['id']:
-        await update.message.reply_text("❌ It's not your turn!")
-        return
+
+    async with game.lock:
+        user = update.effective_user
+        current_player = game.players[game.current_player_index]
     
-    game.cancel_timeout()
-    game.eliminated_players.add(user.id)
-    game.reset_streak(user.id)
-    db.update_word_stats(user.id, user.first_name, "", 0, forfeit=True)
+        if user.id != current_player['id']:
+            await update.message.reply_text("❌ It's not your turn!")
+            return
     
-    await update.message.reply_text(f"⛔ <b>You forfeited!</b> (-10 pts)\n\nYour accumulated points are valid.", parse_mode='HTML')
+        game.cancel_timeout()
+        alive_players = game.eliminate(user.id)
+        game.reset_streak(user.id)
+        await asyncio.to_thread(db.update_word_stats, user.id, user.first_name, "", 0, forfeit=True)
     
-    game.next_turn()
+        await update.message.reply_text(f"⛔ <b>You forfeited!</b> (-10 pts)\n\nYour accumulated points are valid.", parse_mode='HTML')
     
-    if len(game.eliminated_players) >= len(game.players) - 1:
-        winner = next((p for p in game.players if p['id'] not in game.eliminated_players), None)
-        if winner:
-            await update.message.reply_text(f"🏆 *GAME OVER\\!*\n\n👑 *Winner:* @{winner['username']}", parse_mode='MarkdownV2')
-        game.reset()
-        return
+        if len(alive_players) <= 1:
+            winner = alive_players[0] if alive_players else None
+            if winner:
+                await update.message.reply_html(GAME_OVER_MSG % winner['safe_username'])
+            game.reset()
+            return
     
-    next_player = game.players[game.current_player_index]
-    while next_player['id'] in game.eliminated_players:
+        # At least two players remain, so next_turn() lands on one of them
         game.next_turn()
         next_player = game.players[game.current_player_index]
     
-    turn_time = game.get_turn_time()
-    game.current_turn_user_id = next_player['id']
-    await update.message.reply_text(
-        f"👉 @{next_player['username']}'s Turn\n"
-        f"Target: *exactly {game.current_word_length} letters* starting with *'{game.current_start_letter.upper()}'*\n"
-        f"⏱️ *Time: {turn_time}s*",
-        parse_mode='MarkdownV2'
-    )
+        turn_time = game.get_turn_time()
+        game.current_turn_user_id = next_player['id']
+        await update.message.reply_html(TURN_PROMPT % (
+            next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time))
     
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], context.application))
+        game.schedule_timeout(chat_id, next_player['id'], context.application, turn_time)
 
 async def setbio_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler for /setbio and /bio"""
@@ -1404,43 +1939,6 @@ async def setbio_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     db.set_bio(user.id, bio_text)
     await update.message.reply_text("✅ Bio updated! To change it again, you'll need to buy another Bio Access.")
 
-async def omnipotent_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Admin command to grant points or infinity"""
-    if is_message_stale(update): return
-    chat_id = update.effective_chat.id
-    user = update.effective_user
-    
-    # Check if user is bot owner OR has specific omnipotent permission
-    if not db.is_user_omnipotent(user.id):
-        await update.message.reply_text("You can't grasp this power! [ACCESS DENIED]")
-        return
-    
-    if not update.message.reply_to_message or not update.message.reply_to_message.from_user:
-        await update.message.reply_text("❌ Reply to a user's message with /omnipotent [points]\nExample: Reply with /omnipotent 100 or /omnipotent infinite")
-        return
-    
-    target_user = update.message.reply_to_message.from_user
-    points = 0
-    is_infinite = False
-    
-    if context.args:
-        arg = context.args[0].lower()
-        if arg in ['infinite', 'inf', '∞']:
-            is_infinite = True
-            points = 999999999
-        elif arg.isdigit():
-            points = int(arg)
-        else:
-            await update.message.reply_text("❌ Usage: Reply with /omnipotent [points/infinite]")
-            return
-    else:
-        await update.message.reply_text("❌ Usage: Reply with /omnipotent [points]")
-        return
-    
-    db.add_balance(target_user.id, points)
-    gift_text = "<b>INFINITE pts</b>" if is_infinite else f"<b>+{points} pts</b>"
-    await update.message.reply_text(f"✨ @{target_user.username} received {gift_text} from <b>@{user.username}</b>!", parse_mode='HTML')
-
 async def shop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     chat_id = update.effective_chat.id
@@ -1453,19 +1951,10 @@ async def shop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Cannot access shop during an active game! Finish the game first with /stop")
         return
     
-    balance = db.get_balance(user.id)
+    # One inventory read covers the balance and every owned count
     inventory = db.get_inventory(user.id)
-    
-    text = f"🛍️ <b>SHOP</b> 💰 Balance: <b>{balance} pts</b>\n\n"
-    for boost_type, details in SHOP_BOOSTS.items():
-        owned = inventory.get(boost_type, 0)
-        text += f"{details['description']}\n💵 Price: <b>{details['price']} pts</b> - Owned: <b>{owned}</b>\n/buy_{boost_type}\n\n"
-    
-    text += "<b>🖋️ PERSONAL BIO</b>\n"
-    text += "└ 🏷️ Price: <code>500</code> pts | /buy_bio\n"
-    text += "<i>Set a custom message on your profile (Max 40 words). Access consumed on use.</i>\n\n"
-    text += "Example: /buy_hint to purchase hint boost"
-    await update.message.reply_text(text, parse_mode='HTML')
+    text = SHOP_TEMPLATE % (inventory.get('balance', 0), *(inventory.get(k, 0) for k in SHOP_BOOSTS))
+    await send(context.bot, chat_id, text, reply_to=update.message, parse_mode='HTML')
 async def buy_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     chat_id = update.effective_chat.id
@@ -1479,15 +1968,10 @@ async def buy_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Cannot buy boosts during an active game! Finish the game first with /stop")
         return
     
-    boost_type = None
-    if "/buy_hint" in message_text: boost_type = 'hint'
-    elif "/buy_skip" in message_text: boost_type = 'skip'
-    elif "/buy_rebound" in message_text: boost_type = 'rebound'
-    elif "/buy_streak" in message_text: boost_type = 'streak'
-    elif "/buy_bio" in message_text: boost_type = 'bio'
-    elif "/buy_bal_photo" in message_text: boost_type = 'bal_photo'
+    # Command token is "/buy_<boost>", optionally addressed as "/buy_<boost>@botname" in groups
+    boost_type = BUY_COMMANDS.get(message_text.split(maxsplit=1)[0].partition('@')[0])
     
-    if not boost_type:
+    if boost_type is None:
         await update.message.reply_text("❌ Invalid boost! Use: /buy_hint, /buy_skip, /buy_rebound, /buy_streak, /buy_bio, or /buy_bal_photo")
         return
     
@@ -1523,7 +2007,15 @@ async def mystats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not check_rate_limit(user.id, 'mystats'):
         return
     
-    stats = db.get_player_stats(user.id)
+    # Stats query and profile photo lookup overlap instead of running back to back
+    stats, photo_id = await asyncio.gather(
+        asyncio.to_thread(db.get_player_stats, user.id),
+        get_profile_photo_id(context.bot, user.id),
+        return_exceptions=True
+    )
+    if isinstance(stats, Exception):
+        logger.error(f"Error fetching stats for {user.id}: {stats}")
+        stats = None
 
     if not stats:
         await update.message.reply_text("📊 You haven't played any games yet! Join a /lobby to start.")
@@ -1538,11 +2030,13 @@ async def mystats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"🔥 Best Streak: <b>{stats[6]}</b>"
     )
 
+    if isinstance(photo_id, Exception):
+        logger.error(f"Error fetching profile photo: {str(photo_id)}")
+        photo_id = None
+
     try:
-        profile_photos = await context.bot.get_user_profile_photos(user.id, limit=1)
-        if profile_photos.photos:
-            photo = profile_photos.photos[0][-1]
-            await update.message.reply_photo(photo=photo, caption=stats_text, parse_mode='HTML')
+        if photo_id:
+            await update.message.reply_photo(photo=photo_id, caption=stats_text, parse_mode='HTML')
         else:
             await update.message.reply_text(stats_text, parse_mode='HTML')
     except Exception as e:
@@ -1562,35 +2056,36 @@ async def hint_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     game = games[chat_id]
-    if user.id != game.players[game.current_player_index]['id']:
-        await update.message.reply_text("❌ It's not your turn!")
-        return
+
+    async with game.lock:
+        if user.id != game.players[game.current_player_index]['id']:
+            await update.message.reply_text("❌ It's not your turn!")
+            return
     
-    if game.booster_limits.get('hint', 1) == -1:
-        await update.message.reply_text("❌ Hint boosts are disabled for this game!")
-        return
+        if game.booster_limits.get('hint', 1) == -1:
+            await update.message.reply_text("❌ Hint boosts are disabled for this game!")
+            return
         
-    # Check game limit for this specific player
-    limit = game.booster_limits.get('hint', 1)
-    player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
+        # Check game limit for this specific player
+        limit = game.booster_limits.get('hint', 1)
+        player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
     
-    if player_usage['hint'] >= limit:
-        await update.message.reply_text(f"❌ You've reached your hint limit ({limit}) for this game!")
-        return
+        if player_usage['hint'] >= limit:
+            await update.message.reply_text(f"❌ You've reached your hint limit ({limit}) for this game!")
+            return
     
-    inventory = db.get_inventory(user.id)
-    if inventory['hint'] <= 0:
-        await update.message.reply_text(f"❌ No hint boosts! Buy one for {SHOP_BOOSTS['hint']['price']} pts")
-        return
+        inventory = db.get_inventory(user.id)
+        if inventory['hint'] <= 0:
+            await update.message.reply_text(f"❌ No hint boosts! Buy one for {SHOP_BOOSTS['hint']['price']} pts")
+            return
     
-    words = [w for w in game.dictionary if len(w) == game.current_word_length and w.startswith(game.current_start_letter)][:3]
-    if words:
-        db.use_boost(user.id, 'hint')
-        player_usage['hint'] += 1
-        text = f"📖 *Hint\\!* Possible words: {', '.join(words)}"
-        await update.message.reply_text(text, parse_mode='MarkdownV2')
-    else:
-        await update.message.reply_text("❌ No valid words found!")
+        words = list(game.words_by_start_len.get((game.current_start_letter, game.current_word_length), ())[:3])
+        if words:
+            db.use_boost(user.id, 'hint')
+            player_usage['hint'] += 1
+            await update.message.reply_html(f"📖 <b>Hint!</b> Possible words: {', '.join(words)}")
+        else:
+            await update.message.reply_text("❌ No valid words found!")
 
 async def skip_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
@@ -1605,37 +2100,40 @@ async def skip_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     game = games[chat_id]
-    if user.id != game.players[game.current_player_index]['id']:
-        await update.message.reply_text("❌ It's not your turn!")
-        return
+
+    async with game.lock:
+        if user.id != game.players[game.current_player_index]['id']:
+            await update.message.reply_text("❌ It's not your turn!")
+            return
     
-    if game.booster_limits.get('skip', 1) == -1:
-        await update.message.reply_text("❌ Skip boosts are disabled for this game!")
-        return
+        if game.booster_limits.get('skip', 1) == -1:
+            await update.message.reply_text("❌ Skip boosts are disabled for this game!")
+            return
         
-    # Check game limit for this specific player
-    limit = game.booster_limits.get('skip', 1)
-    player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
+        # Check game limit for this specific player
+        limit = game.booster_limits.get('skip', 1)
+        player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
     
-    if player_usage['skip'] >= limit:
-        await update.message.reply_text(f"❌ You've reached your skip limit ({limit}) for this game!")
-        return
+        if player_usage['skip'] >= limit:
+            await update.message.reply_text(f"❌ You've reached your skip limit ({limit}) for this game!")
+            return
     
-    inventory = db.get_inventory(user.id)
-    if inventory['skip'] <= 0:
-        await update.message.reply_text(f"❌ No skip boosts! Buy one for {SHOP_BOOSTS['skip']['price']} pts")
-        return
+        inventory = db.get_inventory(user.id)
+        if inventory['skip'] <= 0:
+            await update.message.reply_text(f"❌ No skip boosts! Buy one for {SHOP_BOOSTS['skip']['price']} pts")
+            return
     
-    db.use_boost(user.id, 'skip')
-    player_usage['skip'] += 1
-    game.cancel_timeout()
-    game.next_turn()
-    next_player = game.players[game.current_player_index]
-    turn_time = game.get_turn_time()
-    game.current_turn_user_id = next_player['id']
+        db.use_boost(user.id, 'skip')
+        player_usage['skip'] += 1
+        game.cancel_timeout()
+        game.next_turn()
+        next_player = game.players[game.current_player_index]
+        turn_time = game.get_turn_time()
+        game.current_turn_user_id = next_player['id']
     
-    await update.message.reply_text(f"⏭️ @{user.username} used skip boost\\!\n\n👉 @{next_player['username']}'s Turn\nTarget: *exactly {game.current_word_length} letters* starting with *'{game.current_start_letter.upper()}'*\n⏱️ *Time: {turn_time}s*", parse_mode='MarkdownV2')
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], context.application))
+        await update.message.reply_html(f"⏭️ @{user.username} used skip boost!\n\n" + TURN_PROMPT % (
+            next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time))
+        game.schedule_timeout(chat_id, next_player['id'], context.application, turn_time)
 
 async def rebound_boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
@@ -1646,53 +2144,58 @@ async def rebound_boost_command(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     game = games[chat_id]
-    if user.id != game.players[game.current_player_index]['id']:
-        await update.message.reply_text("❌ It's not your turn!")
-        return
+
+    async with game.lock:
+        if user.id != game.players[game.current_player_index]['id']:
+            await update.message.reply_text("❌ It's not your turn!")
+            return
     
-    if game.booster_limits.get('rebound', 1) == -1:
-        await update.message.reply_text("❌ Rebound boosts are disabled for this game!")
-        return
+        if game.booster_limits.get('rebound', 1) == -1:
+            await update.message.reply_text("❌ Rebound boosts are disabled for this game!")
+            return
         
-    # Check game limit for this specific player
-    limit = game.booster_limits.get('rebound', 1)
-    player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
+        # Check game limit for this specific player
+        limit = game.booster_limits.get('rebound', 1)
+        player_usage = game.player_booster_usage.setdefault(user.id, {'hint': 0, 'skip': 0, 'rebound': 0})
     
-    if player_usage['rebound'] >= limit:
-        await update.message.reply_text(f"❌ You've reached your rebound limit ({limit}) for this game!")
-        return
+        if player_usage['rebound'] >= limit:
+            await update.message.reply_text(f"❌ You've reached your rebound limit ({limit}) for this game!")
+            return
     
-    inventory = db.get_inventory(user.id)
-    if inventory['rebound'] <= 0:
-        await update.message.reply_text(f"❌ No rebound boosts! Buy one for {SHOP_BOOSTS['rebound']['price']} pts")
-        return
+        inventory = db.get_inventory(user.id)
+        if inventory['rebound'] <= 0:
+            await update.message.reply_text(f"❌ No rebound boosts! Buy one for {SHOP_BOOSTS['rebound']['price']} pts")
+            return
     
-    db.use_boost(user.id, 'rebound')
-    player_usage['rebound'] += 1
-    game.cancel_timeout()
-    # Pass preserve_challenge=True to keep the same letter and length
-    game.next_turn(preserve_challenge=True)
-    next_player = game.players[game.current_player_index]
-    turn_time = game.get_turn_time()
-    game.current_turn_user_id = next_player['id']
+        db.use_boost(user.id, 'rebound')
+        player_usage['rebound'] += 1
+        game.cancel_timeout()
+        # Pass preserve_challenge=True to keep the same letter and length
+        game.next_turn(preserve_challenge=True)
+        next_player = game.players[game.current_player_index]
+        turn_time = game.get_turn_time()
+        game.current_turn_user_id = next_player['id']
     
-    await update.message.reply_text(f"🔄 @{user.username} rebounded\\!\n\n👉 @{next_player['username']}'s Turn \\(SAME QUESTION\\)\nTarget: *exactly {game.current_word_length} letters* starting with *'{game.current_start_letter.upper()}'*\n⏱️ *Time: {turn_time}s*", parse_mode='MarkdownV2')
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], context.application))
+        await update.message.reply_html(f"🔄 @{user.username} rebounded!\n\n" + REBOUND_TURN_PROMPT % (
+            next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time))
+        game.schedule_timeout(chat_id, next_player['id'], context.application, turn_time)
 
 async def inventory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     inventory = db.get_inventory(user.id)
-    balance = db.get_balance(user.id)
-    
-    text = f"📦 <b>{user.first_name}'s Inventory</b>\n\n"
-    text += f"💰 Balance: <b>{balance} pts</b>\n\n"
-    text += "<b>Boosts Owned:</b>\n"
-    text += f"📖 Hints: <b>{inventory['hint']}</b>\n"
-    text += f"⏭️ Skips: <b>{inventory['skip']}</b>\n"
-    text += f"🔄 Rebounds: <b>{inventory['rebound']}</b>\n\n"
-    text += "Visit /shop to buy more boosts!"
+    balance = inventory['balance']
+    
+    parts = [
+        f"📦 <b>{user.first_name}'s Inventory</b>\n\n",
+        f"💰 Balance: <b>{balance} pts</b>\n\n",
+        "<b>Boosts Owned:</b>\n",
+        f"📖 Hints: <b>{inventory['hint']}</b>\n",
+        f"⏭️ Skips: <b>{inventory['skip']}</b>\n",
+        f"🔄 Rebounds: <b>{inventory['rebound']}</b>\n\n",
+        "Visit /shop to buy more boosts!",
+    ]
     
-    await update.message.reply_text(text, parse_mode='HTML')
+    await send(context.bot, update.effective_chat.id, ''.join(parts), reply_to=update.message, parse_mode='HTML')
 
 async def omnipotent_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Admin command to grant points or infinity"""
@@ -1715,12 +2218,15 @@ async def omnipotent_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     if context.args:
         arg = context.args[0].lower()
-        if arg in ['infinite', 'inf', '∞']:
-            is_infinite = True
-            points = 999999999
-        elif arg.isdigit():
+        try:
             points = int(arg)
-        else:
+        except ValueError:
+            if arg in ('infinite', 'inf', '∞'):
+                is_infinite = True
+                points = 999_999_999
+            else:
+                points = -1
+        if points < 0:
             await update.message.reply_text("❌ Usage: Reply with /omnipotent [points/infinite]")
             return
     else:
@@ -1738,13 +2244,13 @@ async def daily_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Get last claim date
     last_claim = db.get_player_last_daily(user.id)
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = _today_str()
     
     if last_claim == today:
         await update.message.reply_text("⏳ You've already claimed your daily reward today! Come back tomorrow.")
         return
     
-    reward = random.randint(10, 100)
+    reward = _RAND.randint(10, 100)
     db.add_balance(user.id, reward)
     db.update_player_last_daily(user.id, today)
     
@@ -1798,17 +2304,11 @@ async def donate_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Amount must be greater than 0!")
         return
     
-    current_balance = db.get_balance(user.id)
-    if current_balance < amount:
-        await update.message.reply_text(f"❌ Insufficient balance! You have {current_balance} pts.")
+    # Perform transfer (balance check, both balances and the target's leaderboard row in one transaction)
+    if not await asyncio.to_thread(db.transfer_balance, user.id, target_user.id, amount, target_user.first_name):
+        await update.message.reply_text(f"❌ Insufficient balance! You have {db.get_balance(user.id)} pts.")
         return
-    
-    # Perform transfer
-    db.add_balance(user.id, -amount)
-    db.add_balance(target_user.id, amount)
-    
-    # Ensure target exists in DB
-    db.ensure_player_exists(target_user.id, target_user.first_name)
+    _KNOWN_USERS.add(target_user.id)
     
     await update.message.reply_text(
         f"💸 <b>Donation Successful!</b>\n\n"
@@ -1822,87 +2322,60 @@ async def donate_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def achievements_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """View only unlocked achievements/titles"""
     user = update.effective_user
-    unlocked_list = db.get_unlocked_titles(user.id)
-    unlocked_stages = {}
-    for entry in unlocked_list:
-        if ':' in entry:
-            k, s = entry.split(':')
-            unlocked_stages[k] = max(unlocked_stages.get(k, 0), int(s))
-        elif entry:
-            unlocked_stages[entry] = max(unlocked_stages.get(entry, 0), 1)
+    unlocked_stages = db.get_title_stages(user.id)
             
     active = db.get_active_title(user.id)
     
-    text = "🏆 <b>Your Unlocked Titles</b>\n\n"
+    parts = ["🏆 <b>Your Unlocked Titles</b>\n\n"]
     has_any = False
     
     # Check exclusive first
-    if user.id == BOT_OWNER_ID:
-        text += f"✨ <b>KAMI</b>\n  <i>Exclusive Divine Title</i>\n\n"
+    if user.id in _KAMI_IDS:
+        parts.append("✨ <b>KAMI</b>\n  <i>Exclusive Divine Title</i>\n\n")
         has_any = True
         
-    for title_key, title_data in TITLES.items():
-        if title_data.get('exclusive'): continue
-            
+    for title_key, display in NON_EXCLUSIVE_TITLE_ROWS:
         stage = unlocked_stages.get(title_key, 0)
         if stage > 0:
             has_any = True
-            text += f"<b>{title_data['display']}</b> "
-            text += STAGES[stage]['display']
+            parts.append(f"<b>{display}</b> ")
+            parts.append(STAGES[stage]['display'])
             if title_key == active:
-                text += " ⭐ (Equipped)"
-            text += f"\n  <i>Current Level: {stage}/5</i>\n\n"
+                parts.append(" ⭐ (Equipped)")
+            parts.append(f"\n  <i>Current Level: {stage}/5</i>\n\n")
     
     if not has_any:
-        text += "<i>No titles unlocked yet. Keep playing to earn achievements!</i>\n"
+        parts.append("<i>No titles unlocked yet. Keep playing to earn achievements!</i>\n")
     
-    text += "\n/progress - Check what you need next\n/settitle [title] - Change your title"
-    await update.message.reply_text(text, parse_mode='HTML')
+    parts.append("\n/progress - Check what you need next\n/settitle [title] - Change your title")
+    await update.message.reply_text(''.join(parts), parse_mode='HTML')
 
 async def progress_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """View upcoming requirements and milestones"""
     user = update.effective_user
-    unlocked_list = db.get_unlocked_titles(user.id)
-    unlocked_stages = {}
-    for entry in unlocked_list:
-        if ':' in entry:
-            k, s = entry.split(':')
-            unlocked_stages[k] = max(unlocked_stages.get(k, 0), int(s))
-        elif entry:
-            unlocked_stages[entry] = max(unlocked_stages.get(entry, 0), 1)
-            
-    text = "📊 <b>Title Progress & Requirements</b>\n\n"
-    for title_key, title_data in TITLES.items():
-        if title_data.get('exclusive'): continue
+    unlocked_stages = db.get_title_stages(user.id)
             
+    parts = ["📊 <b>Title Progress & Requirements</b>\n\n"]
+    for title_key, display in NON_EXCLUSIVE_TITLE_ROWS:
         current_stage = unlocked_stages.get(title_key, 0)
-        text += f"<b>{title_data['display']}</b> "
+        parts.append(f"<b>{display}</b> ")
         
         # Draw progress bar
         for s in range(1, 6):
-            text += STAGES[s]['display'] if s <= current_stage else "▫️"
+            parts.append(STAGES[s]['display'] if s <= current_stage else "▫️")
         
-        text += "\n"
+        parts.append("\n")
         if current_stage < 5:
             next_stage = current_stage + 1
             
-            if title_key == 'shadow':
-                shadow_reqs = {1: 3, 2: 5, 3: 7, 4: 9, 5: 12}
-                req_val = shadow_reqs.get(next_stage, 12)
-            else:
-                req_val = int(title_data['base_req'] * STAGES[next_stage]['multiplier'])
-                
-            desc = title_data['desc'].format(req=req_val)
-            text += f"  <i>Next Stage {next_stage}: {desc}</i>\n"
+            req_val = TITLE_STAGE_REQS[title_key][1][current_stage]
+            desc = TITLE_REQ_DESCS[title_key].format(req=req_val)
+            parts.append(f"  <i>Next Stage {next_stage}: {desc}</i>\n")
         else:
-            text += "  <i>MAX LEVEL REACHED!</i> 💎\n"
-        text += "\n"
+            parts.append("  <i>MAX LEVEL REACHED!</i> 💎\n")
+        parts.append("\n")
     
-    await update.message.reply_text(text, parse_mode='HTML')
-
-    text += f"\n{beauty_border}"
-    
-    await update.message.reply_text(text, parse_mode='HTML')
+    await update.message.reply_text(''.join(parts), parse_mode='HTML')
 
 async def settitle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
@@ -1919,7 +2392,7 @@ async def settitle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     is_exclusive = TITLES[title].get('exclusive', False)
     
-    if is_exclusive and user.id != BOT_OWNER_ID:
+    if is_exclusive and user.id not in _KAMI_IDS:
         await update.message.reply_text(f"❌ {TITLES[title]['display']} is exclusive to the bot owner!")
         return
     
@@ -1928,8 +2401,7 @@ async def settitle_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if unlocked_stage == 0:
         can_unlock = db.check_title_unlock(user.id, title)
         if not can_unlock:
-            req = TITLES.get(title, {})
-            await update.message.reply_text(f"❌ Requirements not met!\n{req.get('desc', '').format(req=req.get('base_req', ''))}\n\nUse /progress to see your status")
+            await update.message.reply_text(f"❌ Requirements not met!\n{TITLE_REQ_DESCS.get(title, '').format(req=TITLES[title].get('base_req', ''))}\n\nUse /progress to see your status")
             return
         db.unlock_title(user.id, title)
     
@@ -1969,18 +2441,11 @@ async def vscpu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     game.is_running = True
     game.group_owner = user.id
     
-    display_name = str(user.first_name or user.username or "Player").strip()
-    if not display_name or display_name == "None":
-        display_name = "Player"
-    username_to_store = (user.username if user.username else display_name).lstrip('@')
+    display_name, username_to_store = _normalize_name(user)
     
-    game.players = [
-        {'id': user.id, 'name': display_name, 'username': username_to_store},
-        {'id': 999999, 'name': '🤖 CPU', 'username': 'cpu'}
-    ]
-    game.initialize_player_stats(user.id)
-    game.initialize_player_stats(999999)
-    db.ensure_player_exists(user.id, username_to_store)
+    game.add_player(user.id, display_name, username_to_store)
+    game.add_player(999999, '🤖 CPU', 'cpu')
+    ensure_player(user.id, username_to_store)
     games[chat_id] = game
     
     # Inherit current global game mode (nerd/chaos)
@@ -1998,16 +2463,14 @@ async def vscpu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     turn_time = game.get_turn_time()
     game.current_turn_user_id = user.id
     
-    difficulty_emoji = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
-    await update.message.reply_text(
-        f"🎮 <b>1v1 vs CPU 🤖</b>\n"
-        f"Difficulty: {difficulty_emoji.get(difficulty, '🟡')} <b>{difficulty.upper()}</b>\n\n"
-        f"👉 {display_name}'s Turn\n"
-        f"Target: <b>exactly {game.current_word_length} letters</b> starting with <b>'{game.current_start_letter.upper()}'</b>\n"
-        f"⏱️ <b>Time: {turn_time}s</b>",
-        parse_mode='HTML'
-    )
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, user.id, context.application))
+    await update.message.reply_html(
+        _solo_start_text("🎮 <b>1v1 vs CPU 🤖</b>", difficulty, f"👉 {display_name}'s Turn", game, turn_time))
+    game.schedule_timeout(chat_id, user.id, context.application, turn_time)
+
+def _solo_start_text(header: str, difficulty: str, lead: str, game, turn_time: int) -> str:
+    """Opening message for /vscpu and /practice: header, difficulty badge, then the first target"""
+    return (f"{header}\nDifficulty: {DIFFICULTY_EMOJI.get(difficulty, '🟡')} <b>{difficulty.upper()}</b>\n\n{lead}\n"
+            + TURN_TARGET % (game.current_word_length, game.current_start_letter_upper, turn_time))
 
 async def cpu_turn(chat_id: int, application):
     """Handle CPU player turn"""
@@ -2018,53 +2481,60 @@ async def cpu_turn(chat_id: int, application):
     # Wait a bit to simulate "thinking"
     await asyncio.sleep(2)
     
-    # Ensure it's actually CPU's turn
-    if game.players[game.current_player_index]['id'] != 999999:
-        return
+    # Turn state (used words, streaks, eliminations, rotation) only changes under the game lock
+    async with game.lock:
+        # /stop or /forfeit may have ended the game while the CPU was "thinking"
+        if games.get(chat_id) is not game or not game.is_running:
+            return
+        # Ensure it's actually CPU's turn
+        if game.players[game.current_player_index]['id'] != 999999:
+            return
 
-    cpu_word = game.get_cpu_word()
+        cpu_word = game.get_cpu_word()
     
-    if not cpu_word:
-        await application.bot.send_message(chat_id, "🤖 CPU forfeit! (No valid words)")
-        game.eliminated_players.add(999999)
-    else:
-        game.used_words.add(cpu_word)
-        game.increment_streak(999999)
-        await application.bot.send_message(chat_id, f"🤖 CPU played: <b>{cpu_word}</b> (+{len(cpu_word)})", parse_mode='HTML')
-    
-    # Check for winner BEFORE next turn
-    alive_players = [p for p in game.players if p['id'] not in game.eliminated_players]
-    if len(alive_players) <= 1:
-        winner = alive_players[0] if alive_players else None
-        if winner:
-            await application.bot.send_message(chat_id, f"🏆 <b>{winner['name']} WINS!</b>", parse_mode='HTML')
-            if winner['id'] != 999999:
-                db.increment_games_played(winner['id'])
-        game.reset()
-        if chat_id in games:
-            del games[chat_id]
-        return
+        # The CPU's move is sent together with whatever follows it (winner or next turn) in one message
+        if not cpu_word:
+            cpu_text = "🤖 CPU forfeit! (No valid words)"
+            alive_players = game.eliminate(999999)
+        else:
+            game.used_words.add(hash(cpu_word))
+            game.increment_streak(999999)
+            cpu_text = f"🤖 CPU played: <b>{cpu_word}</b> (+{len(cpu_word)})"
+            alive_players = [p for p in game.players if p['id'] not in game.eliminated_players]
+    
+        # Check for winner BEFORE next turn
+        if len(alive_players) <= 1:
+            winner = alive_players[0] if alive_players else None
+            if winner:
+                await application.bot.send_message(chat_id, f"{cpu_text}\n\n🏆 <b>{winner['name']} WINS!</b>", parse_mode='HTML')
+                if winner['id'] != 999999:
+                    await asyncio.to_thread(db.increment_games_played, winner['id'])
+            else:
+                await application.bot.send_message(chat_id, cpu_text, parse_mode='HTML')
+            game.reset()
+            if chat_id in games:
+                del games[chat_id]
+            return
 
-    game.next_turn()
+        game.next_turn()
     
-    next_player = game.players[game.current_player_index]
-    turn_time = game.get_turn_time()
-    game.current_turn_user_id = next_player['id']
+        next_player = game.players[game.current_player_index]
+        turn_time = game.get_turn_time()
+        game.current_turn_user_id = next_player['id']
     
-    await application.bot.send_message(
-        chat_id,
-        f"👉 @{next_player['username']}'s Turn\n"
-        f"Target: <b>exactly {game.current_word_length} letters</b> starting with <b>'{game.current_start_letter.upper()}'</b>\n"
-        f"⏱️ <b>Time: {turn_time}s</b>",
-        parse_mode='HTML'
-    )
+        await application.bot.send_message(
+            chat_id,
+            f"{cpu_text}\n\n" + TURN_PROMPT % (
+                next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time),
+            parse_mode='HTML'
+        )
     
-    # Start timeout task for the next player
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], application))
+        # Start timeout task for the next player
+        game.schedule_timeout(chat_id, next_player['id'], application, turn_time)
     
-    # If the next player is also CPU (unlikely in 1v1 but good for safety), trigger it
-    if next_player['id'] == 999999:
-        asyncio.create_task(cpu_turn(chat_id, application))
+        # If the next player is also CPU (unlikely in 1v1 but good for safety), trigger it
+        if next_player['id'] == 999999:
+            asyncio.create_task(cpu_turn(chat_id, application))
 
 async def practice_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Me vs Me - Solo practice mode"""
@@ -2087,32 +2557,21 @@ async def practice_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     game.set_difficulty(difficulty)
     game.is_running = True
     game.is_practice = True
-    display_name = str(user.first_name or user.username or "Player").strip()
-    if not display_name or display_name == "None":
-        display_name = "Player"
-    game.players = [{'id': user_id, 'name': display_name, 'username': user.username or display_name}]
-    game.initialize_player_stats(user_id)
+    display_name, username_to_store = _normalize_name(user)
+    game.add_player(user_id, display_name, username_to_store)
     games[chat_id] = game
     
     game.next_turn()
     turn_time = game.get_turn_time()
     game.current_turn_user_id = user_id
     
-    difficulty_emoji = {'easy': '🟢', 'medium': '🟡', 'hard': '🔴'}
-    await update.message.reply_text(
-        f"🎮 <b>ME VS ME - PRACTICE MODE</b>\n"
-        f"Difficulty: {difficulty_emoji.get(difficulty, '🟡')} <b>{difficulty.upper()}</b>\n\n"
-        f"💪 Challenge yourself and build a streak!\n"
-        f"Target: <b>exactly {game.current_word_length} letters</b> starting with <b>'{game.current_start_letter.upper()}'</b>\n"
-        f"⏱️ <b>Time: {turn_time}s</b>\n\n"
-        f"Type your word below!",
-        parse_mode='HTML'
-    )
-    game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, user_id, context.application))
+    await update.message.reply_html(
+        _solo_start_text("🎮 <b>ME VS ME - PRACTICE MODE</b>", difficulty, "💪 Challenge yourself and build a streak!", game, turn_time)
+        + "\n\nType your word below!")
+    game.schedule_timeout(chat_id, user_id, context.application, turn_time)
 
-async def groupdesc_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Display group chat description and rules"""
-    group_description = """
+# Static /groupdesc text
+GROUP_DESCRIPTION = """
 🎮 <b>WORD GAME GROUP - RULES & DESCRIPTION</b>
 
 📝 <b>About This Group:</b>
@@ -2146,11 +2605,35 @@ Repeated violations may result in removal from the group.
 This group is for everyone. Let's play fair and treat each other with kindness.
 
 Questions? Use /help for game commands!
-    """
-    await update.message.reply_text(group_description, parse_mode='HTML')
+"""
 
-import os
-from PIL import Image
+async def groupdesc_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Display group chat description and rules"""
+    await update.message.reply_text(GROUP_DESCRIPTION, parse_mode='HTML')
+
+# Kami /bal image, re-encoded once at startup so /bal does no disk or Pillow work
+KAMI_IMAGE_PATH = "attached_assets/Picsart_25-12-25_07-48-43-245_1766820109612.png"
+KAMI_COMPRESSED_PATH = "attached_assets/kami_balance_compressed.jpg"
+
+def _compress_kami(src: str) -> Optional[bytes]:
+    """Downscale and JPEG-encode the kami balance image; None if it can't be read"""
+    try:
+        with Image.open(src) as img:
+            img = img.convert("RGB")
+            img.thumbnail((1024, 1024))
+            buf = BytesIO()
+            img.save(buf, "JPEG", quality=70, optimize=True)
+            return buf.getvalue()
+    except Exception as e:
+        logger.error(f"Error compressing kami balance image: {e}")
+        return None
+
+def _load_kami_jpeg() -> Optional[bytes]:
+    return _compress_kami(KAMI_COMPRESSED_PATH if os.path.exists(KAMI_COMPRESSED_PATH) else KAMI_IMAGE_PATH)
+
+KAMI_RETRY_INTERVAL = 600  # Seconds between re-encode attempts after a failed load (e.g. asset missing)
+KAMI_JPEG = _load_kami_jpeg()
+_kami_retry_at = time.monotonic() + KAMI_RETRY_INTERVAL  # Only read while KAMI_JPEG is None
 
 async def setbalpic_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Allow users to set their custom /bal picture after buying access"""
@@ -2166,219 +2649,58 @@ async def setbalpic_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     photo = update.message.reply_to_message.photo[-1].file_id
-    db.set_custom_bal_photo(user.id, photo)
-    # Re-enable the license by setting has_bal_photo_access back to 1
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("UPDATE titles SET has_bal_photo_access = 1 WHERE user_id = ?", (user.id,))
-    conn.commit()
-    conn.close()
+    # The license stays enabled after setting the photo (has_bal_photo_access remains 1)
+    await asyncio.to_thread(db.set_custom_bal_photo, user.id, photo, keep_access=True)
     await update.message.reply_text("✅ Your custom /bal picture has been set!")
 
 async def balance_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Check shop points balance"""
+    global KAMI_JPEG, _kami_retry_at
     if is_message_stale(update): return
     user = update.effective_user
     
     # Use the dedicated get_balance method to get shop inventory points
     balance = db.get_balance(user.id)
     
-    is_kami = (user.id == BOT_OWNER_ID)
-    custom_photo = db.get_custom_bal_photo(user.id)
-    
-    if is_kami:
-        # Check if kami_balance_compressed.jpg exists, otherwise use original or try to compress
-        image_path = "attached_assets/Picsart_25-12-25_07-48-43-245_1766820109612.png"
-        compressed_path = "attached_assets/kami_balance_compressed.jpg"
-        
+    if user.id in _KAMI_IDS:
+        if KAMI_JPEG is None and time.monotonic() >= _kami_retry_at:
+            # Startup encode failed; retry now and then on a worker thread so Pillow never blocks the event loop
+            _kami_retry_at = time.monotonic() + KAMI_RETRY_INTERVAL
+            KAMI_JPEG = await asyncio.to_thread(_load_kami_jpeg)
+        photo = KAMI_JPEG
         caption = (
             f"✨ <b>KAMI BALANCE</b> ✨\n\n"
             f"👤 <b>Developer:</b> {user.first_name}\n"
             f"💰 <b>Shop Points:</b> {balance} pts\n\n"
             f"<i>The ultimate power resides here.</i>"
         )
-        
-        try:
-            # Check if file exists before trying to open it
-            final_path = compressed_path if os.path.exists(compressed_path) else image_path
-            
-            if os.path.exists(final_path):
-                with open(final_path, 'rb') as photo_file:
-                    await update.message.reply_photo(
-                        photo=photo_file,
-                        caption=caption,
-                        parse_mode='HTML'
-                    )
-            else:
-                # Fallback to text if image is missing
-                await update.message.reply_text(caption, parse_mode='HTML')
-        except Exception as e:
-            logger.error(f"Error sending kami balance image: {e}")
-            await update.message.reply_text(caption, parse_mode='HTML')
-    elif custom_photo:
+    else:
+        photo = db.get_custom_bal_photo(user.id)
         caption = (
             f"💰 <b>Your Balance</b>\n\n"
             f"👤 <b>Player:</b> {user.first_name}\n"
             f"💎 <b>Shop Points:</b> {balance} pts\n\n"
             f"Use /shop to spend your points!"
         )
-        try:
-            await update.message.reply_photo(photo=custom_photo, caption=caption, parse_mode='HTML')
-        except Exception as e:
-            logger.error(f"Error sending custom balance photo: {e}")
-            await update.message.reply_text(caption, parse_mode='HTML')
-    else:
-        await update.message.reply_text(
-            f"💰 <b>Your Balance</b>\n\n"
-            f"👤 <b>Player:</b> {user.first_name}\n"
-            f"💎 <b>Shop Points:</b> {balance} pts\n\n"
-            f"Use /shop to spend your points!",
-            parse_mode='HTML'
-        )
+    await _reply_with_photo(update.message, photo, caption)
 
-async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user = update.effective_user
-    
-    # Rate limiting
-    if not check_rate_limit(user.id, 'profile'):
-        return
-    
-    target_user_id = user.id
-    target_username = user.first_name if user.first_name else "Player"
-    
-    if update.message.reply_to_message and update.message.reply_to_message.from_user:
-        replied_user = update.message.reply_to_message.from_user
-        target_user_id = replied_user.id
-        target_username = replied_user.username if replied_user.username else (replied_user.first_name if replied_user.first_name else "Player")
-    elif context.args and len(context.args) > 0:
-        search_query = context.args[0].lstrip('@').lower().strip()
-        
+async def _reply_with_photo(message, photo, caption: str):
+    """Reply with the photo (bytes or file_id) and HTML caption, or with the caption alone if there is none or it fails"""
+    if photo:
         try:
-            if search_query.isdigit():
-                target_user_id = int(search_query)
-            else:
-                conn = sqlite3.connect(DB_FILE)
-                c = conn.cursor()
-                
-                # Try exact match first (case-insensitive)
-                c.execute("SELECT user_id, username FROM leaderboard WHERE LOWER(TRIM(username)) = ? LIMIT 1", (search_query,))
-                result = c.fetchone()
-                
-                # Try partial match (for partial names and nicknames)
-                if not result:
-                    c.execute("SELECT user_id, username FROM leaderboard WHERE LOWER(TRIM(username)) LIKE ? LIMIT 1", (f"%{search_query}%",))
-                    result = c.fetchone()
-                
-                conn.close()
-                
-                if result:
-                    target_user_id = result[0]
-                    target_username = result[1]
-                else:
-                    await update.message.reply_text(f"❌ User '{context.args[0]}' not found!\n\n💡 Tips:\n• Make sure they've played at least one game\n• Reply to their message with /profile\n• Or use their numeric ID: /profile [user_id]")
-                    return
-        except Exception as e:
-            logger.error(f"Profile search error: {e}")
-            await update.message.reply_text(f"❌ Error searching for user!")
+            await message.reply_photo(photo=photo, caption=caption, parse_mode='HTML')
             return
-    
-    # Check if user is banned
-    is_banned, expiry = db.is_user_banned(user.id)
-    if is_banned:
-        if expiry:
-            await update.message.reply_text(f"🚫 You are currently banned from playing! Expiry: {expiry.strftime('%Y-%m-%d %H:%M')}\n\nYou can pay a 200 point fine to unban immediately with /payfine")
-        else:
-            await update.message.reply_text("🚫 You are permanently banned from playing!\n\nYou can pay a 200 point fine to unban immediately with /payfine")
-        return
-
-    # Auto-unlock titles BEFORE fetching stats for display
-    # This ensures the progress bars reflect the latest state
-    db.auto_unlock_titles(target_user_id)
-
-    stats = db.get_player_stats(target_user_id)
-    if not stats:
-        await update.message.reply_text("❌ No stats found for this player!")
-        return
-    
-    unlocked_list = db.get_unlocked_titles(target_user_id)
-    unlocked_stages = {}
-    total_stages = 0
-    for entry in unlocked_list:
-        if ':' in entry:
-            try:
-                k, s = entry.split(':')
-                val = int(s)
-                if k in unlocked_stages:
-                    if val > unlocked_stages[k]:
-                        total_stages += (val - unlocked_stages[k])
-                        unlocked_stages[k] = val
-                else:
-                    unlocked_stages[k] = val
-                    total_stages += val
-            except (ValueError, IndexError):
-                continue
-        elif entry:
-            # Handle legacy format
-            if entry not in unlocked_stages:
-                unlocked_stages[entry] = 1
-                total_stages += 1
-
-    # Determine active title and Divine status
-    active_key = db.get_active_title(target_user_id)
+        except TelegramError as e:
+            logger.error(f"Error sending balance photo: {e}")
+    await message.reply_text(caption, parse_mode='HTML')
+
+@lru_cache(maxsize=4096)
+def _render_profile(target_user_id, target_username, stats, active_key, unlocked_items, target_banned, target_expiry, bio_data, is_self):
+    """Render the /profile HTML; cached per (user, stats, title, unlocked, ban, bio)"""
+    unlocked_stages = dict(unlocked_items)
+    total_stages = sum(unlocked_stages.values())
     title_display = ""
     is_kami = False
-    
-    # Check if requester is banned
-    is_banned, expiry = db.is_user_banned(user.id)
-    if is_banned:
-        if expiry:
-            await update.message.reply_text(f"🚫 You are currently banned from playing! Expiry: {expiry.strftime('%Y-%m-%d %H:%M')}\n\nYou can pay a 200 point fine to unban immediately with /payfine")
-        else:
-            await update.message.reply_text("🚫 You are permanently banned from playing!\n\nYou can pay a 200 point fine to unban immediately with /payfine")
-        return
-
-    # Check if target user is banned
-    target_banned, target_expiry = db.is_user_banned(target_user_id)
-    
-    # Title Themes Definition
-    TITLE_THEMES = {
-        'legend': {
-            'header': "👑 <b>𝐋𝐄𝐆𝐄𝐍𝐃𝐀𝐑𝐘 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 👑",
-            'border': "🌟 ━━━━━━━━━━━ 🌟",
-            'symbol': "🏆",
-            'decoration': "<i>『 The history remembers your name. 』</i>"
-        },
-        'warrior': {
-            'header': "⚔️ <b>𝐖𝐀𝐑𝐑𝐈𝐎𝐑 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> ⚔️",
-            'border': "🩸 ━━━━━━━━━━━ 🩸",
-            'symbol': "🛡️",
-            'decoration': "<i>『 Strength and honor above all. 』</i>"
-        },
-        'sage': {
-            'header': "🧙 <b>𝐒𝐀𝐆𝐄 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🧙",
-            'border': "📜 ━━━━━━━━━━━ 📜",
-            'symbol': "🔮",
-            'decoration': "<i>『 Wisdom is the ultimate weapon. 』</i>"
-        },
-        'phoenix': {
-            'header': "🔥 <b>𝐏𝐇𝐎𝐄𝐍𝐈𝐗 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🔥",
-            'border': "🌋 ━━━━━━━━━━━ 🌋",
-            'symbol': "🐦‍🔥",
-            'decoration': "<i>『 From the ashes, I shall rise. 』</i>"
-        },
-        'shadow': {
-            'header': "🌑 <b>𝐒𝐇𝐀𝐃𝐎𝐖 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> 🌑",
-            'border': "🕶️ ━━━━━━━━━━━ 🕶️",
-            'symbol': "🗝️",
-            'decoration': "<i>『 Silent as a whisper, deadly as night. 』</i>"
-        },
-        'kami': {
-            'header': "✨ <b>𝐃𝐈𝐕𝐈𝐍𝐄 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b> ✨",
-            'border': "✦ ━━━━━━━━━━━ ✦",
-            'symbol': "🌌",
-            'decoration': "<i>『 The one neither above nor below all. 』</i>"
-        }
-    }
 
     if active_key in TITLES:
         if TITLES[active_key].get('exclusive'):
@@ -2388,7 +2710,7 @@ async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             stage = unlocked_stages.get(active_key, 1)
             stage_data = STAGES.get(stage, STAGES[1])
             title_display = f"{stage_data['color']} <b>{TITLES[active_key]['display']} {stage_data['display']}</b>"
-    elif target_user_id == BOT_OWNER_ID:
+    elif target_user_id in _KAMI_IDS:
         active_key = 'kami'
         title_display = f"<b>{TITLES['kami']['display']}</b> ✨"
         is_kami = True
@@ -2419,70 +2741,55 @@ async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             profile_header = "👤 <b>𝐏𝐋𝐀𝐘𝐄𝐑 𝐏𝐑𝐎𝐅𝐈𝐋𝐄</b>"
         theme_decoration = ""
 
-    profile_text = f"<code>{beauty_border}</code>\n"
-    profile_text += f"{profile_header}\n"
-    profile_text += f"<code>{beauty_border}</code>\n\n"
-    
-    profile_text += f"<b>NAME:</b> <code>{target_username}</code>\n"
+    parts = [
+        f"<code>{beauty_border}</code>\n",
+        f"{profile_header}\n",
+        f"<code>{beauty_border}</code>\n\n",
+        f"<b>NAME:</b> <code>{target_username}</code>\n",
+    ]
     
     # Show Ban Status in Profile
     if target_banned:
         ban_msg = f" (Expires: {target_expiry.strftime('%Y-%m-%d %H:%M')})" if target_expiry else " (Permanent)"
-        profile_text += f"🚫 <b>𝐒𝐭𝐚𝐭𝐮𝐬:</b> <code>BANNED{ban_msg}</code>\n"
+        parts.append(f"🚫 <b>𝐒𝐭𝐚𝐭𝐮𝐬:</b> <code>BANNED{ban_msg}</code>\n")
         
     if title_display:
-        profile_text += f"<b>TITLE:</b> {title_display}\n"
+        parts.append(f"<b>TITLE:</b> {title_display}\n")
     else:
-        profile_text += f"<b>TITLE:</b> 🔒 Locked\n"
+        parts.append(f"<b>TITLE:</b> 🔒 Locked\n")
     
     if theme_decoration:
-        profile_text += f"{theme_decoration}\n\n"
+        parts.append(f"{theme_decoration}\n\n")
     else:
-        profile_text += "\n"
+        parts.append("\n")
     
     # Bio section (Enhanced display)
-    bio_data, _ = db.get_bio(target_user_id)
     if bio_data:
-        profile_text += f"📝 <b>BIO</b>\n"
-        profile_text += f"« <i>{bio_data}</i> »\n\n"
-    elif target_user_id == user.id:
-        profile_text += f"💡 <i>Tip: Use /buy_bio to add a personal message!</i>\n\n"
+        parts.append(f"📝 <b>BIO</b>\n")
+        parts.append(f"« <i>{bio_data}</i> »\n\n")
+    elif is_self:
+        parts.append(f"💡 <i>Tip: Use /buy_bio to add a personal message!</i>\n\n")
     
     # Statistics section (Requested layout)
-    profile_text += f"📊 <b>STATISTICS</b>\n"
-    profile_text += f" ┣ 🎯 Score: <code>{stats[7]}</code>\n"
-    profile_text += f" ┣ 📝 Words: <code>{stats[2]}</code>\n"
-    profile_text += f" ┣ 🔥 Streak: <code>{stats[6]}</code>\n"
-    profile_text += f" ┣ 🎮 Games: <code>{stats[3]}</code>\n"
-    profile_text += f" ┣ 📏 Longest: <code>{stats[4]}</code> ({stats[5]}L)\n"
-    profile_text += f" ┗ 📈 Average: <code>{stats[8] if stats[8] is not None else 0.0:.1f}</code>\n\n"
+    parts.append(f"📊 <b>STATISTICS</b>\n")
+    parts.append(f" ┣ 🎯 Score: <code>{stats[7]}</code>\n")
+    parts.append(f" ┣ 📝 Words: <code>{stats[2]}</code>\n")
+    parts.append(f" ┣ 🔥 Streak: <code>{stats[6]}</code>\n")
+    parts.append(f" ┣ 🎮 Games: <code>{stats[3]}</code>\n")
+    parts.append(f" ┣ 📏 Longest: <code>{stats[4]}</code> ({stats[5]}L)\n")
+    parts.append(f" ┗ 📈 Average: <code>{stats[8] if stats[8] is not None else 0.0:.1f}</code>\n\n")
 
     if not is_kami:
-        profile_text += f"🏆 <b>MASTERY LEVELS</b>\n"
-        for t_key, t_data in TITLES.items():
-            if t_data.get('exclusive'): continue
-            
+        parts.append(f"🏆 <b>MASTERY LEVELS</b>\n")
+        for t_key, t_display in NON_EXCLUSIVE_TITLE_ROWS:
             # Use current stage to show next goal
-            current_s = db.get_title_stage(target_user_id, t_key)
+            current_s = unlocked_stages.get(t_key, 0)
             
             # Progress tracking (X/Y)
             if current_s < 5:
-                next_stage = current_s + 1
-                
-                # Shadow Special Logic
-                if t_key == 'shadow':
-                    shadow_reqs = {1: 3, 2: 6, 3: 9, 4: 12, 5: 15}
-                    req_val = shadow_reqs.get(next_stage, 15)
-                else:
-                    req_val = int(t_data['base_req'] * STAGES[next_stage]['multiplier'])
-                
-                player_stats = db.get_player_stats(target_user_id)
-                current_val = 0
-                if t_key == 'legend': current_val = player_stats[7]
-                elif t_key == 'warrior': current_val = player_stats[6]
-                elif t_key == 'sage': current_val = player_stats[2]
-                elif t_key == 'phoenix': current_val = player_stats[3]
-                elif t_key == 'shadow': current_val = player_stats[5]
+                column, reqs = TITLE_STAGE_REQS[t_key]
+                req_val = reqs[current_s]
+                current_val = stats[column]
                 
                 display_val = min(current_val, req_val)
                 progress_str = f"({display_val}/{req_val})"
@@ -2490,22 +2797,88 @@ async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 progress_str = "(MAX)"
                 
             bar = "▰" * current_s + "▱" * (5 - current_s)
-            profile_text += f" {t_data['display'][:2]} {bar} <code>{progress_str}</code>\n"
+            parts.append(f" {t_display[:2]} {bar} <code>{progress_str}</code>\n")
     else:
-        profile_text += f"🌌 <b>CELESTIAL MASTERY</b>\n"
-        profile_text += f"<i>『ƈʀɨʍֆօռ♦』alone is the honored one.</i>\n"
+        parts.append(f"🌌 <b>CELESTIAL MASTERY</b>\n")
+        parts.append(f"<i>『ƈʀɨʍֆօռ♦』alone is the honored one.</i>\n")
+    
+    parts.append(f"\n<code>{beauty_border}</code>")
+    return ''.join(parts)
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    user = update.effective_user
+    
+    # Rate limiting
+    if not check_rate_limit(user.id, 'profile'):
+        return
+    
+    target_user_id = user.id
+    target_username = user.first_name if user.first_name else "Player"
+    
+    if update.message.reply_to_message and update.message.reply_to_message.from_user:
+        replied_user = update.message.reply_to_message.from_user
+        target_user_id = replied_user.id
+        target_username = replied_user.username if replied_user.username else (replied_user.first_name if replied_user.first_name else "Player")
+    elif context.args and len(context.args) > 0:
+        search_query = context.args[0].lstrip('@').lower().strip()
+        
+        try:
+            if search_query.isdigit():
+                target_user_id = int(search_query)
+            else:
+                # The partial-match fallback can scan the whole table, so keep it off the event loop
+                result = await asyncio.to_thread(db.find_user_by_name, search_query)
+                
+                if result:
+                    target_user_id = result[0]
+                    target_username = result[1]
+                else:
+                    await update.message.reply_text(f"❌ User '{context.args[0]}' not found!\n\n💡 Tips:\n• Make sure they've played at least one game\n• Reply to their message with /profile\n• Or use their numeric ID: /profile [user_id]")
+                    return
+        except Exception as e:
+            logger.error(f"Profile search error: {e}")
+            await update.message.reply_text(f"❌ Error searching for user!")
+            return
+    
+    # Check if user is banned
+    is_banned, expiry = db.is_user_banned(user.id)
+    if is_banned:
+        if expiry:
+            await update.message.reply_text(f"🚫 You are currently banned from playing! Expiry: {expiry.strftime('%Y-%m-%d %H:%M')}\n\nYou can pay a 200 point fine to unban immediately with /payfine")
+        else:
+            await update.message.reply_text("🚫 You are permanently banned from playing!\n\nYou can pay a 200 point fine to unban immediately with /payfine")
+        return
+
+    def load_profile():
+        # Title unlocks happen on the write paths (word stats, games played), so this stays read-only
+        stats = db.get_player_stats(target_user_id)
+        if not stats:
+            return None
+        # Title stages, active title (Divine status), target ban state and bio
+        return (stats, db.get_title_stages(target_user_id), db.get_active_title(target_user_id),
+                db.is_user_banned(target_user_id), db.get_bio(target_user_id)[0])
+
+    # The profile photo lookup runs while the DB reads happen in a worker thread
+    photo_task = asyncio.create_task(get_profile_photo_id(context.bot, target_user_id))
+    loaded = await asyncio.to_thread(load_profile)
+    if loaded is None:
+        photo_task.cancel()
+        await update.message.reply_text("❌ No stats found for this player!")
+        return
+    stats, unlocked_stages, active_key, (target_banned, target_expiry), bio_data = loaded
     
-    profile_text += f"\n<code>{beauty_border}</code>"
+    profile_text = _render_profile(
+        target_user_id, target_username, tuple(stats), active_key,
+        tuple(sorted(unlocked_stages.items())), target_banned, target_expiry,
+        bio_data, target_user_id == user.id
+    )
     
     try:
-        profile_photos = await context.bot.get_user_profile_photos(target_user_id, limit=1)
-        if profile_photos.photos:
-            photo_list = profile_photos.photos[0]
-            largest_photo = photo_list[-1]
-            
+        photo_id = await photo_task
+        if photo_id:
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=largest_photo.file_id,
+                photo=photo_id,
                 caption=profile_text,
                 parse_mode='HTML'
             )
@@ -2536,6 +2909,11 @@ async def grant_permission(update: Update, context: ContextTypes.DEFAULT_TYPE):
         db.set_user_omnipotent(target.id, False)
         await update.message.reply_text(f"❌ Revoked omnipotent powers from @{target.username}")
 
+TAGALL_HEADER = "📢 <b>ATTENTION EVERYONE!</b> 📢\n\n"
+TAGALL_DEFAULT_MSG = "Wake up! A new challenge awaits!"  # Used when .tagall has no message of its own
+# ".tagall" as a whole word at the start of a message, any case; checked against every plain text message
+_TAGALL_RE = re.compile(r'^\.tagall\b', re.IGNORECASE)
+
 async def tagall_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Mention all known members in this chat"""
     if is_message_stale(update): return
@@ -2543,53 +2921,29 @@ async def tagall_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     # Check if user is bot owner OR has specific omnipotent permission OR is an admin
-    is_owner = (user.id == BOT_OWNER_ID)
-    is_authorized = db.is_user_omnipotent(user.id)
-    is_admin = False
-    
-    try:
-        chat_member = await context.bot.get_chat_member(chat_id, user.id)
-        is_admin = chat_member.status in ['creator', 'administrator']
-    except:
-        pass
-
-    if not (is_owner or is_authorized or is_admin):
+    if not (db.is_user_omnipotent(user.id) or await is_chat_admin(context.bot, chat_id, user.id)):
         await update.message.reply_text("❌ Only the bot owner, authorized users, or admins can use .tagall!")
         return
 
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    # Get all unique users seen in this specific chat
-    c.execute("SELECT DISTINCT user_id, username FROM chat_members WHERE chat_id = ?", (chat_id,))
-    rows = c.fetchall()
-    conn.close()
+    # Write this chat's not-yet-flushed sightings first so the query below sees every member
+    pending = [(chat_id, user_id, _PENDING_MEMBERS.pop((chat_id, user_id)))
+               for member_chat, user_id in list(_PENDING_MEMBERS) if member_chat == chat_id]
+
+    def load_tags():
+        if pending:
+            db.upsert_chat_members(pending)
+        return db.get_chat_member_tags(chat_id)
+
+    unique_usernames = await asyncio.to_thread(load_tags)
     
-    if not rows:
+    if not unique_usernames:
         await update.message.reply_text("❌ No members tracked in this chat yet!")
         return
         
-    tag_msg = "📢 <b>ATTENTION EVERYONE!</b> 📢\n\n"
-    usernames = []
-    for user_id, name in rows:
-        if name:
-            # Check if it's already a formatted link or a simple @username
-            if name.startswith('@'):
-                usernames.append(name)
-            elif '<a href=' in name:
-                usernames.append(name)
-            else:
-                # Fallback for old data or edge cases: create a mention link
-                usernames.append(f'<a href="tg://user?id={user_id}">{name}</a>')
-    
-    # Sort for a clean look
-    unique_usernames = sorted(list(set(usernames)))
-    
     # Telegram allows up to 4096 characters per message.
     # We join them with spaces.
-    tag_msg += " ".join(unique_usernames)
-    
-    custom_msg = " ".join(context.args) if context.args else "Wake up! A new challenge awaits!"
-    tag_msg += f"\n\n💬 {custom_msg}"
+    custom_msg = " ".join(context.args) if context.args else TAGALL_DEFAULT_MSG
+    tag_msg = f"{TAGALL_HEADER}{' '.join(unique_usernames)}\n\n💬 {custom_msg}"
     
     await update.message.reply_text(tag_msg, parse_mode='HTML')
 
@@ -2611,67 +2965,76 @@ async def reset_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
     try:
-        # Delete from all tables
-        c.execute("DELETE FROM leaderboard WHERE user_id=?", (user.id,))
-        c.execute("DELETE FROM inventory WHERE user_id=?", (user.id,))
-        c.execute("DELETE FROM titles WHERE user_id=?", (user.id,))
-        # Optional: c.execute("DELETE FROM permissions WHERE user_id=?", (user.id,)) 
-        
-        conn.commit()
-        await update.message.reply_text(
-            "🔄 <b>PROFILE RESET COMPLETE</b>\n\n"
-            "Your game data has been wiped. You are now starting fresh!",
-            parse_mode='HTML'
-        )
-    except Exception as e:
+        await asyncio.to_thread(db.reset_user, user.id)
+    except sqlite3.Error as e:
         logger.error(f"Error resetting user {user.id}: {e}")
         await update.message.reply_text("❌ An error occurred while resetting your profile.")
-    finally:
-        conn.close()
+        return
+    _KNOWN_USERS.discard(user.id)
+    await update.message.reply_text(
+        "🔄 <b>PROFILE RESET COMPLETE</b>\n\n"
+        "Your game data has been wiped. You are now starting fresh!",
+        parse_mode='HTML'
+    )
+
+# Static /help guide; the last sent copy per chat is reused via copy_message for a while
+HELP_TEXT = (
+    "🎮 <b>KURIMUWORDS - MASTER GUIDE</b> 🎮\n\n"
+    "<b>1. HOW TO PLAY</b>\n"
+    "• Submit a word that matches the <b>Starting Letter</b> and <b>Required Length</b>.\n"
+    "• You have 60 seconds (minus difficulty penalty) to answer.\n"
+    "• Points = Word Length. Higher length = More points!\n\n"
+    "<b>2. GAME MODES</b>\n"
+    "🤓 <b>NERD (Progressive):</b> Word length increases every few rounds.\n"
+    "🎲 <b>CHAOS (Random):</b> Every turn has a random length requirement.\n"
+    "💪 <b>PRACTICE:</b> Solo training (/practice [easy/medium/hard]).\n"
+    "🤖 <b>VS CPU:</b> Play against the bot (/vscpu).\n\n"
+    "<b>3. SHOP & BOOSTS</b>\n"
+    "📖 <b>HINT (80 pts):</b> Shows 3 possible words.\n"
+    "⏭️ <b>SKIP (150 pts):</b> Skip your turn without point penalty.\n"
+    "🔄 <b>REBOUND (250 pts):</b> Skip and pass to the next player!\n"
+    "🛡️ <b>STREAK PROTECT (400 pts):</b> Prevents streak reset on timeout.\n\n"
+    "<b>4. TITLES & ACHIEVEMENTS</b>\n"
+    "🏆 <b>/achievements:</b> View your unlocked titles.\n"
+    "📊 <b>/progress:</b> Check milestone requirements.\n"
+    "👤 <b>/profile:</b> Show stats and current title.\n"
+    "🎭 <b>/settitle:</b> Equip an unlocked title.\n\n"
+    "<b>5. CURRENCY & SOCIAL</b>\n"
+    "💰 <b>/balance / /bal:</b> View your points.\n"
+    "🎲 <b>/gamble [amt] [heads/tails]:</b> Risk points (12.5% win, 1.5x payout).\n"
+    "🎁 <b>/donate:</b> Give points to another player.\n"
+    "📅 <b>/daily:</b> Claim your daily reward.\n\n"
+    "<b>6. LOBBY COMMANDS</b>\n"
+    "🏠 <b>/lobby:</b> Create a new game lobby.\n"
+    "➕ <b>/join:</b> Join the current lobby.\n"
+    "🚀 <b>/begin:</b> Start the game.\n"
+    "🛑 <b>/stop:</b> Stop the current game.\n"
+    "⚙️ <b>/difficulty:</b> Set game difficulty.\n"
+    "🛠️ <b>/authority:</b> Set booster limits (Lobby Owner).\n\n"
+    "<i>Compete, earn points, and climb the global leaderboard!</i>\n\n"
+    "✨ <b>Developed by 『ƈʀɨʍֆօռ♦』</b> ✨"
+)
+HELP_CACHE_TTL = 600  # Seconds a chat's last /help message stays reusable
+_HELP_MSG_CACHE: Dict[int, Tuple[int, float]] = {}  # {chat_id: (message_id, monotonic sent time)}
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Complete gameplay guide and rules"""
-    help_text = (
-        "🎮 <b>KURIMUWORDS - MASTER GUIDE</b> 🎮\n\n"
-        "<b>1. HOW TO PLAY</b>\n"
-        "• Submit a word that matches the <b>Starting Letter</b> and <b>Required Length</b>.\n"
-        "• You have 60 seconds (minus difficulty penalty) to answer.\n"
-        "• Points = Word Length. Higher length = More points!\n\n"
-        "<b>2. GAME MODES</b>\n"
-        "🤓 <b>NERD (Progressive):</b> Word length increases every few rounds.\n"
-        "🎲 <b>CHAOS (Random):</b> Every turn has a random length requirement.\n"
-        "💪 <b>PRACTICE:</b> Solo training (/practice [easy/medium/hard]).\n"
-        "🤖 <b>VS CPU:</b> Play against the bot (/vscpu).\n\n"
-        "<b>3. SHOP & BOOSTS</b>\n"
-        "📖 <b>HINT (80 pts):</b> Shows 3 possible words.\n"
-        "⏭️ <b>SKIP (150 pts):</b> Skip your turn without point penalty.\n"
-        "🔄 <b>REBOUND (250 pts):</b> Skip and pass to the next player!\n"
-        "🛡️ <b>STREAK PROTECT (400 pts):</b> Prevents streak reset on timeout.\n\n"
-        "<b>4. TITLES & ACHIEVEMENTS</b>\n"
-        "🏆 <b>/achievements:</b> View your unlocked titles.\n"
-        "📊 <b>/progress:</b> Check milestone requirements.\n"
-        "👤 <b>/profile:</b> Show stats and current title.\n"
-        "🎭 <b>/settitle:</b> Equip an unlocked title.\n\n"
-        "<b>5. CURRENCY & SOCIAL</b>\n"
-        "💰 <b>/balance / /bal:</b> View your points.\n"
-        "🎲 <b>/gamble [amt] [heads/tails]:</b> Risk points (12.5% win, 1.5x payout).\n"
-        "🎁 <b>/donate:</b> Give points to another player.\n"
-        "📅 <b>/daily:</b> Claim your daily reward.\n\n"
-        "<b>6. LOBBY COMMANDS</b>\n"
-        "🏠 <b>/lobby:</b> Create a new game lobby.\n"
-        "➕ <b>/join:</b> Join the current lobby.\n"
-        "🚀 <b>/begin:</b> Start the game.\n"
-        "🛑 <b>/stop:</b> Stop the current game.\n"
-        "⚙️ <b>/difficulty:</b> Set game difficulty.\n"
-        "🛠️ <b>/authority:</b> Set booster limits (Lobby Owner).\n\n"
-        "<i>Compete, earn points, and climb the global leaderboard!</i>\n\n"
-        "✨ <b>Developed by 『ƈʀɨʍֆօռ♦』</b> ✨"
-    )
-    await update.message.reply_text(help_text, parse_mode='HTML')
+    chat_id = update.effective_chat.id
+    cached = _HELP_MSG_CACHE.get(chat_id)
+    if cached and time.monotonic() - cached[1] < HELP_CACHE_TTL:
+        try:
+            await context.bot.copy_message(chat_id=chat_id, from_chat_id=chat_id, message_id=cached[0])
+            return
+        except Exception as e:
+            # Original was probably deleted; fall through and send a fresh one
+            logger.warning(f"Cached help copy failed in {chat_id}: {e}")
+            del _HELP_MSG_CACHE[chat_id]
+    sent = await update.message.reply_text(HELP_TEXT, parse_mode='HTML')
+    _HELP_MSG_CACHE[chat_id] = (sent.message_id, time.monotonic())
+
+# "/authority <booster> <limit>" arguments, e.g. "hint 2", "skip 0", "rebound inf"
+_AUTHORITY_RE = re.compile(r'^(hint|skip|rebound) (\d+|inf|unlimited)$', re.IGNORECASE)
 
 async def authority_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """New simplified Authority system for lobby owners"""
@@ -2698,36 +3061,35 @@ async def authority_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    booster = context.args[0].lower()
-    value_str = context.args[1].lower()
-
-    if booster not in ['hint', 'skip', 'rebound']:
-        await update.message.reply_text("❌ Invalid booster type! Use: hint, skip, or rebound.")
+    # Validate booster and limit in one match before touching any game state
+    match = _AUTHORITY_RE.match(f"{context.args[0]} {context.args[1]}")
+    if not match:
+        if context.args[0].lower() not in ('hint', 'skip', 'rebound'):
+            await update.message.reply_text("❌ Invalid booster type! Use: hint, skip, or rebound.")
+        else:
+            await update.message.reply_text("❌ Invalid limit! Please provide a number or 'inf'.")
         return
+    booster, value_str = match.group(1).lower(), match.group(2).lower()
 
-    try:
-        game._authority_settings_applied = True # Flag to persist these limits for the current game
-        # Reset current game's player usage when authority is changed to ensure clean state
-        game.player_booster_usage = {} 
-        if value_str == 'inf' or value_str == 'unlimited':
-            game.booster_limits[booster] = float('inf')
-        else:
-            limit = int(value_str)
-            game.booster_limits[booster] = limit if limit > 0 else -1
-        
-        status = "Unlimited" if game.booster_limits[booster] == float('inf') else ("Disabled" if game.booster_limits[booster] == -1 else f"{game.booster_limits[booster]} per player")
-        await update.message.reply_text(f"✅ <b>Authority Updated:</b> {booster.capitalize()} is now set to <b>{status}</b>.", parse_mode='HTML')
-    except ValueError:
-        await update.message.reply_text("❌ Invalid limit! Please provide a number or 'inf'.")
+    game._authority_settings_applied = True # Flag to persist these limits for the current game
+    # Reset current game's player usage when authority is changed to ensure clean state
+    game.player_booster_usage = {} 
+    if value_str in ('inf', 'unlimited'):
+        game.booster_limits[booster] = float('inf')
+    else:
+        limit = int(value_str)
+        game.booster_limits[booster] = limit if limit > 0 else -1
+    
+    status = "Unlimited" if game.booster_limits[booster] == float('inf') else ("Disabled" if game.booster_limits[booster] == -1 else f"{game.booster_limits[booster]} per player")
+    await update.message.reply_text(f"✅ <b>Authority Updated:</b> {booster.capitalize()} is now set to <b>{status}</b>.", parse_mode='HTML')
 
 async def ban_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Ban a user from playing (Admin only)"""
     chat_id = update.effective_chat.id
     user = update.effective_user
     
-    # Check if user is admin
-    chat_member = await context.bot.get_chat_member(chat_id, user.id)
-    if chat_member.status not in ['creator', 'administrator'] and user.id != BOT_OWNER_ID:
+    # Check if user is admin (the bot owner skips the API call)
+    if user.id != BOT_OWNER_ID and not await is_chat_admin(context.bot, chat_id, user.id):
         await update.message.reply_text("❌ Only group admins can use /ban!")
         return
 
@@ -2749,8 +3111,8 @@ async def unban_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     user = update.effective_user
     
-    chat_member = await context.bot.get_chat_member(chat_id, user.id)
-    if chat_member.status not in ['creator', 'administrator'] and user.id != BOT_OWNER_ID:
+    # Check if user is admin (the bot owner skips the API call)
+    if user.id != BOT_OWNER_ID and not await is_chat_admin(context.bot, chat_id, user.id):
         await update.message.reply_text("❌ Only group admins can use /unban!")
         return
 
@@ -2823,7 +3185,7 @@ async def gamble_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     db.deduct_balance(user.id, amount)
     
     # 12.5% chance to win (1/8)
-    win = random.random() < 0.125
+    win = _RAND.random() < 0.125
     
     await update.message.reply_text("🪙 The coin is in the air...")
     await asyncio.sleep(1.5)
@@ -2864,141 +3226,222 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # We use double quotes for the attribute to avoid potential nested quote issues
             username = f'<a href="tg://user?id={user.id}">{user.first_name}</a>'
             
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        # Always update the username/link to the latest one seen
-        c.execute("INSERT OR REPLACE INTO chat_members (chat_id, user_id, username) VALUES (?, ?, ?)",
-                 (chat_id, user.id, username))
-        conn.commit()
-        conn.close()
+        # Always keep the latest username/link seen; the flusher batches the write
+        track_member(chat_id, user.id, username)
 
-    if chat_id not in games or not update.message or not update.message.text: return
-    
-    game = games[chat_id]
-    user = update.effective_user
-    msg_text = (update.message.text or "").lower()
+    game = games.get(chat_id)
+    msg = update.message
+    if game is None or msg is None or not msg.text or not game.is_running: return
 
-    # Admin bypass for commands that should always work
-    if msg_text.startswith(('/omnipotent', '/bio', '/setbio', '/buy_', '/bal', '/balance', '/mystats', '/profile', '/leaderboard', '/payfine', '/ban', '/unban')):
+    # Slash-prefixed text is never a game word (commands such as /bal or /buy_ have their own handlers);
+    # a single first-character compare replaces the old per-message prefix-tuple scan
+    if msg.text[0] == '/':
         return
 
     # Check if user is banned before allowing them to play
     is_banned, _ = db.is_user_banned(user.id)
     if is_banned:
-        await update.message.reply_text("🚫 <b>The higher ups have banned your ass.</b>", parse_mode='HTML')
+        await msg.reply_text("🚫 <b>The higher ups have banned your ass.</b>", parse_mode='HTML')
         return
 
-    if not game.is_running: return
-
-    # Turn Validation & Type-Safe ID Check
+    # Turn validation - player ids are always stored as ints
     current_player = game.players[game.current_player_index]
-    
-    # Normalize IDs to strings for comparison
-    msg_user_id = str(user.id)
-    target_user_id = str(current_player['id'])
 
     # Track username update
     username = user.username or user.first_name or "Player"
-    db.ensure_player_exists(user.id, username)
+    ensure_player(user.id, username)
     
     # Authority limits check
-    if msg_user_id != target_user_id:
+    if user.id != current_player['id']:
         # Prevent "Turn Stealing" - Log attempts from other players
-        active_ids = [str(p['id']) for p in game.players if p['id'] not in game.eliminated_players]
-        if msg_user_id in active_ids:
-            logger.warning(f"Turn intercept blocked: {user.first_name} ({msg_user_id}) tried to play during {current_player.get('first_name', 'target')}'s ({target_user_id}) turn.")
-        return
-
-    word_raw = update.message.text.strip()
-    # Check if the message contains spaces - game answers are always single words
-    if ' ' in word_raw:
-        return
-
-    word = word_raw.lower()
-    
-    # Validation
-    if len(word) != game.current_word_length:
-        await update.message.reply_text(f"❌ Word must be exactly {game.current_word_length} letters! Try again.")
+        if user.id in game.player_ids and user.id not in game.eliminated_players:
+            logger.warning(f"Turn intercept blocked: {user.first_name} ({user.id}) tried to play during {current_player.get('name', 'target')}'s ({current_player['id']}) turn.")
         return
 
-    if not word.startswith(game.current_start_letter):
-        await update.message.reply_text(f"❌ Must start with '{game.current_start_letter.upper()}'! Try again.")
-        return
+    async with game.lock:
+        # Another turn may have finished while we waited on the lock
+        if games.get(chat_id) is not game or not game.is_running or game.players[game.current_player_index]['id'] != user.id:
+            return
 
-    if word in game.used_words:
-        await update.message.reply_text("❌ Word already used! Try another.")
-        return
+        word_raw = msg.text.strip()
+        # Check if the message contains spaces - game answers are always single words
+        if ' ' in word_raw:
+            return
 
-    if word not in game.dictionary:
-        await update.message.reply_text("❌ Not in my dictionary! Try again.")
-        return
+        word = word_raw.lower()
+    
+        # Validation: one compound check, cheapest filters first; the reason is only worked out on failure
+        N = game.current_word_length
+        L = game.current_start_letter
+        used = game.used_words
+        word_hash = hash(word)
+        if len(word) != N or word[0] != L or word_hash in used or word not in game.dictionary:
+            if len(word) != N:
+                reason = f"❌ Word must be exactly {N} letters! Try again."
+            elif word[0] != L:
+                reason = f"❌ Must start with '{game.current_start_letter_upper}'! Try again."
+            elif word_hash in used:
+                reason = "❌ Word already used! Try another."
+            else:
+                reason = "❌ Not in my dictionary! Try again."
+            await msg.reply_text(reason)
+            return
 
-    # Process the turn logic FIRST to avoid any state issues
-    game.cancel_timeout()
-    game.used_words.add(word)
-    game.increment_streak(user.id)
-    current_streak = game.get_streak(user.id)
+        # Process the turn logic FIRST to avoid any state issues
+        game.cancel_timeout()
+        game.used_words.add(word_hash)
+        game.increment_streak(user.id)
+        current_streak = game.get_streak(user.id)
     
-    # Update word stats and leaderboard immediately
-    if not game.is_practice:
-        player_name = user.first_name or user.username or "Player"
-        try:
-            db.update_word_stats(user.id, player_name, word, current_streak)
-        except Exception as db_err:
-            logger.error(f"Database error: {db_err}")
-
-    # Check for newly unlocked titles after stats update
-    newly_unlocked = db.auto_unlock_titles(user.id)
-    if newly_unlocked:
-        unlock_msg = "🏆 <b>NEW TITLES UNLOCKED!</b>\n\n"
-        for title_key, stage in newly_unlocked:
-            title_info = TITLES[title_key]
-            stage_info = STAGES[stage]
-            multiplier = stage_info['multiplier']
-            unlock_msg += (
-                f"{stage_info['color']} <b>{title_info['display']} {stage_info['display']}</b>\n"
-                f"<i>Requirement met! Multiplier: {multiplier}x</i>\n\n"
-            )
-        await application.bot.send_message(
-            chat_id=chat_id,
-            text=unlock_msg,
-            parse_mode='HTML'
-        )
+        # Queue word stats for the background writer; it announces any titles the write unlocks
+        if not game.is_practice:
+            player_name = user.first_name or user.username or "Player"
+            queue_word_stats(chat_id, user.id, player_name, word, current_streak)
 
-    difficulty_increased = game.next_turn()
+        difficulty_increased = game.next_turn()
     
-    msg_text = f"✅ '{word}' <b>(+{len(word)})</b>"
-    if current_streak >= 3:
-        msg_text += f"\n🔥 <b>{current_streak} STREAK!</b> You're on fire!"
-    msg_text += "\n\n"
+        msg_text = f"✅ '{word}' <b>(+{len(word)})</b>"
+        if current_streak >= 3:
+            msg_text += f"\n🔥 <b>{current_streak} STREAK!</b> You're on fire!"
+        msg_text += "\n\n"
     
-    if difficulty_increased:
-        msg_text += f"⏱️ <b>Time reduced!</b> Difficulty level {game.difficulty_level}\n\n"
+        if difficulty_increased:
+            msg_text += f"⏱️ <b>Time reduced!</b> Difficulty level {game.difficulty_level}\n\n"
     
-    next_player = game.players[game.current_player_index]
-    turn_time = game.get_turn_time()
-    game.current_turn_user_id = next_player['id']
-    
-    if game.is_practice:
-        msg_text += f"💪 <b>Next Challenge:</b>\n"
-        msg_text += f"Target: <b>exactly {game.current_word_length} letters</b> starting with <b>'{game.current_start_letter.upper()}'</b>\n"
-        msg_text += f"⏱️ <b>Time: {turn_time}s</b>"
-    elif game.is_cpu_game and next_player['id'] == 999999:
-        msg_text += f"🤖 <b>CPU's Turn...</b>"
-    else:
-        msg_text += f"👉 @{next_player['username']}'s Turn\n"
-        msg_text += f"Target: <b>exactly {game.current_word_length} letters</b> starting with <b>'{game.current_start_letter.upper()}'</b>\n"
-        msg_text += f"⏱️ <b>Time: {turn_time}s</b>"
+        next_player = game.players[game.current_player_index]
+        turn_time = game.get_turn_time()
+        game.current_turn_user_id = next_player['id']
+    
+        if game.is_practice:
+            msg_text += "💪 <b>Next Challenge:</b>\n" + TURN_TARGET % (game.current_word_length, game.current_start_letter_upper, turn_time)
+        elif game.is_cpu_game and next_player['id'] == 999999:
+            msg_text += f"🤖 <b>CPU's Turn...</b>"
+        else:
+            msg_text += TURN_PROMPT % (next_player['safe_username'], game.current_word_length, game.current_start_letter_upper, turn_time)
 
-    await update.message.reply_text(msg_text, parse_mode='HTML')
+        await msg.reply_text(msg_text, parse_mode='HTML')
     
-    # CPU turn handler
-    if game.is_cpu_game and next_player['id'] == 999999:
-        # IMPORTANT: Run CPU turn in background
-        asyncio.create_task(cpu_turn(chat_id, context.application))
-    else:
-        game.timeout_task = asyncio.create_task(handle_turn_timeout(chat_id, next_player['id'], context.application))
+        # CPU turn handler
+        if game.is_cpu_game and next_player['id'] == 999999:
+            # IMPORTANT: Run CPU turn in background
+            asyncio.create_task(cpu_turn(chat_id, context.application))
+        else:
+            game.schedule_timeout(chat_id, next_player['id'], context.application, turn_time)
+
+
+async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
+    """Log errors raised by handlers or polling without tearing down the application"""
+    logger.error(f"Update {update} caused error: {context.error}", exc_info=context.error)
+
+# ==========================================
+# UPDATE PROCESSING (per-chat order, cross-chat concurrency)
+# ==========================================
+MAX_CONCURRENT_UPDATES = 64  # Updates in flight at once across all chats
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates concurrently across chats but strictly in arrival order within each chat"""
 
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_pending: Dict[int, int] = {}  # Updates holding or waiting on each chat's lock
+
+    async def process_update(self, update, coroutine):
+        chat = getattr(update, 'effective_chat', None)
+        if chat is None:
+            await super().process_update(update, coroutine)
+            return
+        chat_id = chat.id
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        self._chat_pending[chat_id] = self._chat_pending.get(chat_id, 0) + 1
+        try:
+            # Wait for the chat's turn before taking a global slot, so a backed-up chat queues on its
+            # own lock without starving other chats. asyncio.Lock wakes waiters FIFO, keeping arrival order.
+            async with lock:
+                await super().process_update(update, coroutine)
+        finally:
+            self._chat_pending[chat_id] -= 1
+            if not self._chat_pending[chat_id]:
+                del self._chat_pending[chat_id]
+                del self._chat_locks[chat_id]
+
+    async def do_process_update(self, update, coroutine):
+        await coroutine
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+def build_app():
+    """Build the Application and register all handlers (done once per process)"""
+    application = (
+        ApplicationBuilder().token(BOT_TOKEN)
+        .concurrent_updates(ChatOrderedUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .post_init(start_stats_writer)
+        .post_shutdown(stop_stats_writer)
+        .build()
+    )
+
+    # Read-only commands that wait on photos, admin lookups or DB reads use block=False: they run as
+    # their own tasks, so the next update from the same chat is dispatched without waiting. Game commands
+    # stay blocking so turns within a chat are still handled in order.
+
+    application.add_handler(CommandHandler("start", start))
+    application.add_handler(CommandHandler("lobby", lobby))
+    application.add_handler(CommandHandler("join", join))
+    application.add_handler(CommandHandler("begin", begin_game))
+    application.add_handler(CommandHandler("mode", mode_command))
+    application.add_handler(CommandHandler("difficulty", difficulty))
+    application.add_handler(CommandHandler("stop", stop_game))
+    application.add_handler(CommandHandler("forfeit", forfeit_command))
+    application.add_handler(CommandHandler("mystats", mystats_command, block=False))
+    application.add_handler(CommandHandler("leaderboard", leaderboard, block=False))
+    application.add_handler(CommandHandler("shop", shop_command))
+    application.add_handler(CommandHandler("buy_hint", buy_boost_command))
+    application.add_handler(CommandHandler("buy_skip", buy_boost_command))
+    application.add_handler(CommandHandler("buy_rebound", buy_boost_command))
+    application.add_handler(CommandHandler("buy_streak", buy_boost_command))
+    application.add_handler(CommandHandler("buy_bio", buy_boost_command))
+    application.add_handler(CommandHandler("buy_bal_photo", buy_boost_command))
+    application.add_handler(CommandHandler("hint", hint_boost_command))
+    application.add_handler(CommandHandler("skip", skip_boost_command))
+    application.add_handler(CommandHandler("skip_boost", skip_boost_command))
+    application.add_handler(CommandHandler("rebound", rebound_boost_command))
+    application.add_handler(CommandHandler("inventory", inventory_command))
+    application.add_handler(CommandHandler("omnipotent", omnipotent_command))
+    application.add_handler(CommandHandler("bio", setbio_command))
+    application.add_handler(CommandHandler("setbio", setbio_command))
+    application.add_handler(CommandHandler("donate", donate_command))
+    application.add_handler(CommandHandler("daily", daily_command))
+    application.add_handler(CommandHandler("rules", rules_command))
+    application.add_handler(CommandHandler("authority", authority_command))
+    application.add_handler(CommandHandler("achievements", achievements_command, block=False))
+    application.add_handler(CommandHandler("settitle", settitle_command))
+    application.add_handler(CommandHandler("mytitle", mytitle_command))
+    application.add_handler(CommandHandler("progress", progress_command, block=False))
+    application.add_handler(CommandHandler("profile", profile_command, block=False))
+    application.add_handler(CommandHandler("ban", ban_command))
+    application.add_handler(CommandHandler("unban", unban_command))
+    application.add_handler(CommandHandler("payfine", payfine_command))
+    application.add_handler(CommandHandler("practice", practice_command))
+    application.add_handler(CommandHandler("vscpu", vscpu_command))
+    application.add_handler(CommandHandler("balance", balance_command, block=False))
+    application.add_handler(CommandHandler("bal", balance_command, block=False))
+    application.add_handler(CommandHandler("groupdesc", groupdesc_command))
+    application.add_handler(CommandHandler("grant", grant_permission))
+    application.add_handler(CommandHandler("revoke", grant_permission))
+    application.add_handler(CommandHandler("setbalpic", setbalpic_command))
+    application.add_handler(CommandHandler("reset", reset_command))
+    application.add_handler(CommandHandler("gamble", gamble_command))
+    application.add_handler(MessageHandler(filters.Regex(_TAGALL_RE), tagall_command, block=False))
+    application.add_handler(CommandHandler("help", help_command))
+    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message))
+    application.add_error_handler(error_handler)
+    return application
 
 # ==========================================
 # MAIN EXECUTION - PURE TELEGRAM BOT (runs in separate process via run.py)
@@ -3009,73 +3452,26 @@ if __name__ == '__main__':
     else:
         print("🎮 Telegram Bot Started", flush=True)
         
-        # Infinite retry loop for bot
+        application = build_app()
+        
+        # Retry loop for bot; the application is reused, only polling restarts
         retry_count = 0
         while True:
             try:
                 print(f"🎮 Starting Telegram bot (attempt {retry_count + 1})...", flush=True)
-                application = ApplicationBuilder().token(BOT_TOKEN).build()
-                
-                application.add_handler(CommandHandler("start", start))
-                application.add_handler(CommandHandler("lobby", lobby))
-                application.add_handler(CommandHandler("join", join))
-                application.add_handler(CommandHandler("begin", begin_game))
-                application.add_handler(CommandHandler("mode", mode_command))
-                application.add_handler(CommandHandler("difficulty", difficulty))
-                application.add_handler(CommandHandler("stop", stop_game))
-                application.add_handler(CommandHandler("forfeit", forfeit_command))
-                application.add_handler(CommandHandler("mystats", mystats_command))
-                application.add_handler(CommandHandler("leaderboard", leaderboard))
-                application.add_handler(CommandHandler("shop", shop_command))
-                application.add_handler(CommandHandler("buy_hint", buy_boost_command))
-                application.add_handler(CommandHandler("buy_skip", buy_boost_command))
-                application.add_handler(CommandHandler("buy_rebound", buy_boost_command))
-                application.add_handler(CommandHandler("buy_streak", buy_boost_command))
-                application.add_handler(CommandHandler("buy_bio", buy_boost_command))
-                application.add_handler(CommandHandler("buy_bal_photo", buy_boost_command))
-                application.add_handler(CommandHandler("hint", hint_boost_command))
-                application.add_handler(CommandHandler("skip", skip_boost_command))
-                application.add_handler(CommandHandler("skip_boost", skip_boost_command))
-                application.add_handler(CommandHandler("rebound", rebound_boost_command))
-                application.add_handler(CommandHandler("inventory", inventory_command))
-                application.add_handler(CommandHandler("omnipotent", omnipotent_command))
-                application.add_handler(CommandHandler("bio", setbio_command))
-                application.add_handler(CommandHandler("setbio", setbio_command))
-                application.add_handler(CommandHandler("donate", donate_command))
-                application.add_handler(CommandHandler("daily", daily_command))
-                application.add_handler(CommandHandler("rules", rules_command))
-                application.add_handler(CommandHandler("authority", authority_command))
-                application.add_handler(CommandHandler("achievements", achievements_command))
-                application.add_handler(CommandHandler("settitle", settitle_command))
-                application.add_handler(CommandHandler("mytitle", mytitle_command))
-                application.add_handler(CommandHandler("progress", progress_command))
-                application.add_handler(CommandHandler("profile", profile_command))
-                application.add_handler(CommandHandler("ban", ban_command))
-                application.add_handler(CommandHandler("unban", unban_command))
-                application.add_handler(CommandHandler("payfine", payfine_command))
-                application.add_handler(CommandHandler("practice", practice_command))
-                application.add_handler(CommandHandler("vscpu", vscpu_command))
-                application.add_handler(CommandHandler("balance", balance_command))
-                application.add_handler(CommandHandler("bal", balance_command))
-                application.add_handler(CommandHandler("groupdesc", groupdesc_command))
-                application.add_handler(CommandHandler("grant", grant_permission))
-                application.add_handler(CommandHandler("revoke", grant_permission))
-                application.add_handler(CommandHandler("setbalpic", setbalpic_command))
-                application.add_handler(CommandHandler("reset", reset_command))
-                application.add_handler(CommandHandler("gamble", gamble_command))
-                application.add_handler(MessageHandler(filters.Regex(r'^\.tagall'), tagall_command))
-                application.add_handler(CommandHandler("help", help_command))
-                application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message))
-
-                logger.info("Loaded dictionary words")
                 print("🎮 BOT ONLINE - RUNNING FOREVER UNTIL MANUAL STOP!", flush=True)
-                retry_count = 0
-                application.run_polling()
+                started_at = time.monotonic()
+                application.run_polling(drop_pending_updates=True, close_loop=False)
+                break
             except KeyboardInterrupt:
                 print("\n🛑 Bot stopped by user", flush=True)
                 break
             except Exception as e:
+                # Only back off further when crashes come in quick succession
+                if time.monotonic() - started_at > 60:
+                    retry_count = 0
                 retry_count += 1
+                delay = min(60, 3 * (2 ** min(retry_count, 6)))
                 logger.error(f"Bot crash #{retry_count}: {str(e)}", exc_info=True)
-                print(f"💥 Bot crashed: {e} | AUTO-RESTARTING IN 3s...", flush=True)
-                time.sleep(3)
\ No newline at end of file
+                print(f"💥 Bot crashed: {e} | AUTO-RESTARTING IN {delay}s...", flush=True)
+                time.sleep(delay)
@@ -1,28 +1,29 @@
 """
-Main entry point - runs Flask and Telegram bot in separate processes
-This wrapper ensures both run independently without conflicts
+Main entry point - serves the Flask health endpoint in-process and runs the Telegram bot as a child process
+The bot is restarted whenever it exits; the health server needs no process of its own
 """
 import subprocess
 import sys
 import time
 import atexit
+import queue
+import threading
+
+import flask_app
 
-flask_process = None
 bot_process = None
+exited = queue.Queue()  # (name, detail) posted when the bot process exits or the Flask thread stops
+FLASK_RESTART_DELAY = 5  # Seconds before restarting a failed health server (e.g. port still in use)
+BOT_RESTART_DELAY = 3  # Seconds before restarting the bot; doubles per quick repeat crash
+BOT_RESTART_DELAY_MAX = 60
+BOT_STABLE_AFTER = 60  # Seconds of uptime after which a crash no longer counts as a quick repeat
+bot_started_at = 0.0
+bot_quick_crashes = 0
 
 def cleanup():
     """Clean up processes on exit"""
-    global flask_process, bot_process
+    global bot_process
     print("\n🛑 Cleaning up processes...", flush=True)
-    if flask_process:
-        try:
-            flask_process.terminate()
-            flask_process.wait(timeout=5)
-        except:
-            try:
-                flask_process.kill()
-            except:
-                pass
     if bot_process:
         try:
             bot_process.terminate()
@@ -37,59 +38,63 @@ def cleanup():
 atexit.register(cleanup)
 
 def start_flask():
-    """Start Flask in subprocess - output goes directly to console"""
-    global flask_process
+    """Serve the Flask health endpoint from a daemon thread in this process"""
     print("🌐 Starting Flask server...", flush=True)
-    flask_process = subprocess.Popen(
-        [sys.executable, "flask_app.py"],
-        stdout=None,  # Inherit parent's stdout
-        stderr=None,  # Inherit parent's stderr
-    )
-    print(f"✅ Flask started (PID: {flask_process.pid})", flush=True)
-    return flask_process
+    def run():
+        try:
+            flask_app.serve()
+            exited.put(("flask", "server stopped"))
+        except BaseException as e:
+            exited.put(("flask", repr(e)))
+    threading.Thread(target=run, daemon=True).start()
+    print("✅ Flask started (in-process)", flush=True)
 
 def start_bot():
     """Start Telegram bot in subprocess - output goes directly to console"""
-    global bot_process
+    global bot_process, bot_started_at
     print("🎮 Starting Telegram bot...", flush=True)
+    bot_started_at = time.monotonic()
     bot_process = subprocess.Popen(
         [sys.executable, "main.py"],
         stdout=None,  # Inherit parent's stdout
         stderr=None,  # Inherit parent's stderr
     )
     print(f"✅ Bot started (PID: {bot_process.pid})", flush=True)
+    watch("bot", bot_process)
     return bot_process
 
+def watch(name, process):
+    """Wait for a child in a daemon thread and report its exit to the monitor"""
+    def wait():
+        process.wait()
+        exited.put((name, process))
+    threading.Thread(target=wait, daemon=True).start()
+
 def monitor_processes():
-    """Monitor and restart processes if they die"""
-    last_flask_check = 0
-    last_bot_check = 0
-    
+    """Restart the bot or the health server if either dies; sleeps until one reports an exit"""
+    global bot_quick_crashes
     while True:
-        now = time.time()
-        
-        # Check Flask every 5 seconds
-        if now - last_flask_check >= 5:
-            if flask_process and flask_process.poll() is not None:
-                exit_code = flask_process.returncode
-                print(f"⚠️  Flask died (exit code: {exit_code})! Restarting...", flush=True)
-                start_flask()
-            last_flask_check = now
-        
-        # Check Bot every 5 seconds
-        if now - last_bot_check >= 5:
-            if bot_process and bot_process.poll() is not None:
-                exit_code = bot_process.returncode
-                print(f"⚠️  Bot died (exit code: {exit_code})! Restarting...", flush=True)
-                start_bot()
-            last_bot_check = now
-        
-        time.sleep(2)
+        name, detail = exited.get()
+        if name == "flask":
+            print(f"⚠️  Flask died ({detail})! Restarting in {FLASK_RESTART_DELAY}s...", flush=True)
+            time.sleep(FLASK_RESTART_DELAY)
+            start_flask()
+        else:
+            # Back off on repeated startup crashes so a broken bot isn't respawned in a tight loop
+            if time.monotonic() - bot_started_at > BOT_STABLE_AFTER:
+                bot_quick_crashes = 0
+            delay = min(BOT_RESTART_DELAY_MAX, BOT_RESTART_DELAY * 2 ** bot_quick_crashes)
+            bot_quick_crashes += 1
+            print(f"⚠️  Bot died (exit code: {detail.returncode})! Restarting in {delay}s...", flush=True)
+            # Wait on a timer so a Flask failure in the meantime is still handled promptly
+            timer = threading.Timer(delay, start_bot)
+            timer.daemon = True
+            timer.start()
 
 if __name__ == '__main__':
     print("🚀 LAUNCHING UNBREAKABLE BOT + FLASK", flush=True)
     
-    # Start both processes
+    # Start the health server and the bot
     start_flask()
     time.sleep(1)
     start_bot()